@@ -1,8 +1,11 @@
 import matplotlib.pyplot as plt
 import math as ma
 import pylab as pl
+import time
+from decimal import Context, Decimal
+from fractions import Fraction
 
-def babylonian_square_root(a, e, x0):
+def babylonian_square_root(a, e, x0, callback=None):
     """
     Calculate the square root of a positive number using the Babylonian method.
     
@@ -10,6 +13,9 @@ def babylonian_square_root(a, e, x0):
     a (float): The number to find the square root of, must be positive.
     e (float): The desired level of accuracy, must be positive.
     x0 (float): The initial guess for the square root.
+    callback (function, optional): Called after each iteration with a dict holding
+        the method, iteration k, iterate x, residual x**2 - a, step, evaluations
+        and elapsed seconds. Returning True stops the iteration early.
     
     Returns:
     tuple: The approximate square root and the number of iterations.
@@ -20,12 +26,71 @@ def babylonian_square_root(a, e, x0):
     x = [x0]
     n = 0
     
+    if callback is not None:
+        start = time.perf_counter()
+    
     while abs(x[n]**2 - a) >= e:
         x.append(0.5 * (x[n] + a / x[n]))
         n += 1
+        
+        if callback is not None:
+            state = {"method": "babylonian_square_root", "k": n, "x": x[n], "residual": x[n]**2 - a,
+                     "step": x[n] - x[n - 1], "evaluations": n, "elapsed": time.perf_counter() - start}
+            if callback(state):
+                break
     
     return x[n], n
 
+def _babylonian_isqrt(n):
+    """
+    Return the integer square root floor(sqrt(n)) of a non-negative integer n.
+    
+    The Babylonian iteration is run with the working precision doubled at each
+    step: the root of the leading bits of n is known to within one unit, so a
+    single step x = (x + m / x) / 2 on twice as many bits restores that
+    accuracy. The last step, at full precision, dominates the cost.
+    """
+    if n < 16:
+        return (n > 0) + (n > 3) + (n > 8)
+    
+    # Square root of the leading half of the bits, shifted into place.
+    k = n.bit_length() // 4
+    x = _babylonian_isqrt(n >> 2 * k) << k
+    x = (x + n // x) // 2
+    
+    # Starting from above, one step leaves x within one of the root.
+    while x * x > n:
+        x -= 1
+    while (x + 1) * (x + 1) <= n:
+        x += 1
+    
+    return x
+
+def babylonian_square_root_digits(a, digits):
+    """
+    Calculate the square root of a positive number to a given number of decimal digits.
+    
+    Parameters:
+    a (int, float, str, fractions.Fraction or decimal.Decimal): The number to find the
+        square root of, must be positive. It is converted to an exact fraction.
+    digits (int): The number of digits after the decimal point, must be non-negative.
+    
+    Returns:
+    tuple: The square root truncated to the given digits, as a decimal.Decimal, and the
+        error bound 10**-digits, so that 0 <= sqrt(a) - root < bound.
+    """
+    
+    a = Fraction(Decimal(a)) if isinstance(a, str) else Fraction(a)
+    assert a > 0 and isinstance(digits, int) and digits >= 0, "a must be positive and digits a non-negative integer."
+    
+    # floor(sqrt(p / q) * 10**digits) = isqrt(floor(p * 10**(2 * digits) / q))
+    r = _babylonian_isqrt(a.numerator * 10**(2 * digits) // a.denominator)
+    
+    # Shift the decimal point with enough precision to keep every digit of r.
+    root = Decimal(r).scaleb(-digits, Context(prec=r.bit_length() + 1))
+    
+    return root, Decimal(1).scaleb(-digits)
+
 def babylonian_square_root_list(a, e, x0):
     """
     Calculate the square root of a positive number using the Babylonian method and return the list of approximations.
@@ -81,4 +146,5 @@ def babylonian_square_root_plot(a, e, x0):
     plt.grid(True)
     plt.show()
 
-babylonian_square_root_plot(20000, 1e-10, 1)
+if __name__ == "__main__":
+    babylonian_square_root_plot(20000, 1e-10, 1)
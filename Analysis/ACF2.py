@@ -1,7 +1,8 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import time
 
-def secant_method(f, x0, x1, tol, kmax):
+def secant_method(f, x0, x1, tol, kmax, callback=None):
     """
     Find the root of a function using the secant method.
 
@@ -17,6 +18,10 @@ def secant_method(f, x0, x1, tol, kmax):
         The tolerance for the convergence criterion.
     kmax : int
         The maximum number of iterations.
+    callback : function, optional
+        Called after each iteration with a dict holding the method, iteration k,
+        iterate x, residual f(x), step to the next iterate, evaluations of f and
+        elapsed seconds. Returning True stops the iteration early.
 
     Returns:
     -------
@@ -40,12 +45,25 @@ def secant_method(f, x0, x1, tol, kmax):
     x = [x0, x1]
     ek = abs((x[k + 1] - x[k]) / x[k + 1])
 
+    # Keep the last two function values so each iteration evaluates f once.
+    fx = [f(x0)]
+
+    if callback is not None:
+        start = time.perf_counter()
+
     while (ek >= tol) and (k <= kmax):
         k += 1
-        x_new = x[k] - ((x[k] - x[k - 1]) / (f(x[k]) - f(x[k - 1]))) * f(x[k])
+        fx.append(f(x[k]))
+        x_new = x[k] - ((x[k] - x[k - 1]) / (fx[k] - fx[k - 1])) * fx[k]
         x.append(x_new)
         ek = abs((x[k + 1] - x[k]) / x[k + 1])
 
+        if callback is not None:
+            state = {"method": "secant_method", "k": k, "x": x[k], "residual": fx[k],
+                     "step": x_new - x[k], "evaluations": k + 1, "elapsed": time.perf_counter() - start}
+            if callback(state):
+                break
+
         if k > kmax:
             raise ArithmeticError("Maximum number of iterations exceeded.")
     
@@ -55,6 +73,167 @@ def secant_method(f, x0, x1, tol, kmax):
 
     return xN, eN, N
 
+def broyden_method(F, x0, tol, kmax, J0=None, memory=None, callback=None):
+    """
+    Find a root of a system of nonlinear equations using Broyden's method.
+
+    This is the secant method for systems: an approximate inverse Jacobian H is
+    corrected by a rank-1 update after every step, so each iteration needs one
+    evaluation of F (plus any line search backtracking) instead of the n extra
+    evaluations of a finite difference Jacobian.
+
+    Parameters:
+    ----------
+    F : function
+        The function, mapping an array of length n to an array of length n.
+    x0 : numpy.ndarray
+        Initial guess for the root.
+    tol : float
+        The tolerance for the convergence criterion on the relative step size.
+    kmax : int
+        The maximum number of iterations.
+    J0 : float or numpy.ndarray, optional
+        Initial Jacobian approximation, a scalar multiple of the identity or a
+        matrix. By default it is the scalar F0 . (F(x0 + d F0) - F0) / (d ||F0||^2),
+        the derivative along F0 = F(x0) estimated with one extra evaluation.
+    memory : int, optional
+        If given, H is stored as J0^-1 plus at most this many rank-1 terms, so
+        storage is O(memory * n) instead of O(n^2). When all of them are in use,
+        they are truncated to the leading half of the terms of their SVD before
+        the next update (SciPy's "svd" reduction), the closest approximation of
+        that rank to the current H; with memory=1 this is a restart from J0^-1.
+        This costs O(memory^2 * n) once every memory // 2 or so iterations.
+    callback : function, optional
+        Called after each iteration with a dict holding the method, iteration k,
+        iterate x, residual norm ||F(x)||, step norm, evaluations of F and
+        elapsed seconds. Returning True stops the iteration early.
+
+    Returns:
+    -------
+    tuple
+        xN : numpy.ndarray
+            The estimated root.
+        eN : float
+            The error estimate, the relative size of the last step.
+        N : int
+            The number of iterations performed.
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance (tol) must be positive.")
+    if kmax <= 0:
+        raise ValueError("Maximum iterations (kmax) must be positive.")
+    if memory is not None and memory <= 0:
+        raise ValueError("memory must be positive.")
+
+    x = np.array(x0, dtype=float)
+    n = len(x)
+    Fx = np.asarray(F(x), dtype=float)
+    evaluations = 1
+
+    if J0 is None:
+        d = 1e-7 * max(1, np.linalg.norm(x)) / max(np.linalg.norm(Fx), 1e-300)
+        J0 = Fx @ (np.asarray(F(x + d * Fx), dtype=float) - Fx) / (d * (Fx @ Fx)) if np.any(Fx) else 1.0
+        evaluations += 1
+        J0 = J0 if J0 != 0 else 1.0
+
+    if np.ndim(J0) == 0:
+        H0 = lambda z: z / J0
+        H0T = H0
+    else:
+        H0inv = np.linalg.inv(J0)
+        H0 = lambda z: H0inv @ z
+        H0T = lambda z: H0inv.T @ z
+
+    # H is either a dense matrix or H0 + U[:m].T @ V[:m] with m <= memory rank-1 terms.
+    if memory is None:
+        H = H0(np.eye(n))
+        apply_H = lambda z: H @ z
+        apply_HT = lambda z: H.T @ z
+    else:
+        U = np.zeros((memory, n))
+        V = np.zeros((memory, n))
+        m = 0
+        apply_H = lambda z: H0(z) + U[:m].T @ (V[:m] @ z)
+        apply_HT = lambda z: H0T(z) + V[:m].T @ (U[:m] @ z)
+
+    def restart():
+        nonlocal m
+        if memory is None:
+            H[...] = H0(np.eye(n))
+        else:
+            m = 0
+
+    if callback is not None:
+        start = time.perf_counter()
+
+    k = 0
+    ek = np.inf
+
+    while (ek >= tol) and (k <= kmax):
+        k += 1
+        p = -apply_H(Fx)
+
+        # Backtrack until ||F|| decreases sufficiently; Broyden directions need
+        # not be descent directions, so after a few halvings the step is taken
+        # anyway, and the update below corrects H from it.
+        norm_F = np.linalg.norm(Fx)
+        alpha = 2.0
+        for _ in range(8):
+            # Halve before each try, so s below is the step F_new was evaluated at.
+            alpha /= 2
+            F_new = np.asarray(F(x + alpha * p), dtype=float)
+            evaluations += 1
+            if np.linalg.norm(F_new) <= (1 - 1e-4 * alpha) * norm_F:
+                break
+
+        s = alpha * p
+        y = F_new - Fx
+        x = x + s
+        Fx = F_new
+
+        norm_x = np.linalg.norm(x)
+        ek = np.linalg.norm(s) / norm_x if norm_x > 0 else np.linalg.norm(s)
+
+        # With the memory full, keep the leading SVD terms of U.T @ V, so the
+        # update below is made to the best lower-rank approximation of H.
+        if memory is not None and m == memory and ek >= tol:
+            Qu, Ru = np.linalg.qr(U.T)
+            Qv, Rv = np.linalg.qr(V.T)
+            W, sigma, Zt = np.linalg.svd(Ru @ Rv.T)
+            m = min((memory + 1) // 2, memory - 1, len(sigma))
+            U[:m] = (Qu @ (W[:, :m] * sigma[:m])).T
+            V[:m] = Zt[:m] @ Qv.T
+
+        # Good Broyden update of the inverse: H += (s - H y) (H^T s)^T / (s^T H y).
+        Hy = apply_H(y)
+        d = s @ Hy
+        if d != 0 and np.isfinite(d) and ek >= tol:
+            u = (s - Hy) / d
+            v = apply_HT(s)
+            if memory is None:
+                H += np.outer(u, v)
+            else:
+                U[m], V[m] = u, v
+                m += 1
+        elif ek >= tol:
+            # H maps y orthogonally to s, so this step cannot correct it; start
+            # it again instead of updating it.
+            restart()
+
+        if callback is not None:
+            state = {"method": "broyden_method", "k": k, "x": x, "residual": np.linalg.norm(Fx),
+                     "step": np.linalg.norm(s), "evaluations": evaluations, "elapsed": time.perf_counter() - start}
+            if callback(state):
+                break
+
+        if not np.any(Fx):
+            break
+
+        if k > kmax:
+            raise ArithmeticError("Maximum number of iterations exceeded.")
+
+    return x, ek, k
+
 def secant_method_list(f, x0, x1, tol, kmax):
     """
     Find the root of a function using the secant method and return a list of iterations.
@@ -102,34 +281,232 @@ def secant_method_list(f, x0, x1, tol, kmax):
     
     return r
 
-def f(x):
-    return (x**3 - x**2 + 2*x + 1) / (3*x**2 + 2)
+def _barycentric_weights(x, scale):
+    """
+    Return the barycentric weights of the nodes x, normalised so the largest is 1 in
+    magnitude, and the natural logarithm of the normalising factor.
 
-x = np.linspace(-4, 3, num=1000)
-y = f(x)
+    Products are accumulated as sums of logarithms of the differences scaled by
+    scale, so they neither overflow nor underflow.
+    """
+    D = scale * (x[:, np.newaxis] - x)
+    np.fill_diagonal(D, 1)
+    
+    logw = -np.log(np.abs(D)).sum(axis=1)
+    sign = np.prod(np.sign(D), axis=1)
+    
+    return sign * np.exp(logw - logw.max()), logw.max()
 
-plt.figure(figsize=(20, 10))
-plt.xlim([-3, 2])
-plt.ylim([-1.5, 1])
-plt.plot(x, y, label='f(x)')
+class BarycentricInterpolator:
+    """
+    Lagrange polynomial interpolation in barycentric form.
 
-z = secant_method_list(f, -2, 1, 1e-10, 100)
-print(z)
+    The weights w_j = 1 / prod(x_j - x_k) are computed once in O(n^2), or in
+    closed form for Chebyshev points, after which the interpolant
 
-for n in range(4):
-    plt.plot(z[n][0], z[n][1], "o")
-    plt.annotate(f"z{n}", (z[n][0], z[n][1]))
-    
-    x_line = [z[n][0], z[n + 1][0]]
-    y_line = [z[n][1], z[n + 1][1]]
-    plt.plot(x_line, y_line, label=f"Secant line {n}")
-
-plt.axhline(y=0, color="black", label="y=0")
-
-plt.xlabel("x")
-plt.ylabel("f(x)")
-plt.title("Function f(x) and Secant Method Approximations")
-plt.legend()
-plt.grid(True)
-plt.savefig('outputimage.png')
-plt.show()
+        p(x) = sum(w_j y_j / (x - x_j)) / sum(w_j / (x - x_j))
+
+    costs O(n) per evaluation point. Nodes can be added one at a time in O(n).
+
+    Parameters:
+    ----------
+    x : numpy.ndarray
+        The distinct interpolation nodes.
+    y : numpy.ndarray
+        The values at the nodes.
+    weights : numpy.ndarray, optional
+        Precomputed barycentric weights for the nodes, up to a common factor.
+    """
+
+    def __init__(self, x, y, weights=None):
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        
+        if x.ndim != 1 or x.shape != y.shape or len(x) == 0:
+            raise ValueError("x and y must be non-empty one-dimensional arrays of the same length.")
+        if len(np.unique(x)) != len(x):
+            raise ValueError("Interpolation nodes must be distinct.")
+        
+        # Differences are scaled by 4 / (interval length), the capacity of the interval.
+        self._scale = 4 / (x.max() - x.min()) if len(x) > 1 else 1.0
+        self.x = x
+        self.y = y
+        self._coarse = None
+        
+        # The true weights are self.w * exp(self._logc); the factor is kept so
+        # that weights of added nodes are on the same scale.
+        if weights is None:
+            self.w, self._logc = _barycentric_weights(x, self._scale)
+        else:
+            weights = np.asarray(weights, dtype=float)
+            if weights.shape != x.shape:
+                raise ValueError("There must be one weight per node.")
+            self.w = weights / np.abs(weights).max()
+            
+            # Fix the factor from the true weight of the first node.
+            D = self._scale * (x[0] - x[1:])
+            self._logc = -np.log(np.abs(D)).sum() - np.log(np.abs(self.w[0]))
+
+    @classmethod
+    def chebyshev(cls, f, n, a=-1, b=1):
+        """
+        Interpolate f at n Chebyshev points of the second kind on [a, b].
+
+        The weights are known in closed form: (-1)^j, halved at both ends.
+
+        Parameters:
+        ----------
+        f : function
+            A vectorised function to interpolate.
+        n : int
+            The number of nodes, at least 2.
+        a : float, optional
+            The left end of the interval (default is -1).
+        b : float, optional
+            The right end of the interval (default is 1).
+
+        Returns:
+        -------
+        BarycentricInterpolator
+            The interpolant of f.
+        """
+        if n < 2:
+            raise ValueError("At least two Chebyshev points are needed.")
+        
+        j = np.arange(n)
+        x = (a + b) / 2 + (b - a) / 2 * np.cos(np.pi * j / (n - 1))
+        w = (-1.0)**j
+        w[[0, -1]] /= 2
+        
+        return cls(x, f(x), w)
+
+    def add_node(self, x, y):
+        """
+        Add a node to the interpolant, updating the weights in O(n).
+
+        Parameters:
+        ----------
+        x : float
+            The new node, distinct from the existing ones.
+        y : float
+            The value at the new node.
+        """
+        if np.any(self.x == x):
+            raise ValueError("Interpolation nodes must be distinct.")
+        
+        # Each old weight gains the factor 1 / (x_j - x); the new weight is 1 / prod(x - x_j).
+        D = self._scale * (self.x - x)
+        new = np.prod(np.sign(-D)) * np.exp(-np.log(np.abs(D)).sum() - self._logc)
+        w = np.append(self.w / D, new)
+        
+        m = np.abs(w).max()
+        self.w = w / m
+        self._logc += np.log(m)
+        self.x = np.append(self.x, x)
+        self.y = np.append(self.y, y)
+        self._coarse = None
+
+    def _evaluate(self, x, w, y, nodes, chunk):
+        x = np.asarray(x, dtype=float)
+        t = x.reshape(-1)
+        p = np.empty_like(t)
+        
+        # Points are processed in chunks so the (points, nodes) temporaries stay bounded.
+        step = max(1, chunk // len(nodes))
+        for s in range(0, len(t), step):
+            D = t[s:s + step, np.newaxis] - nodes
+            exact = D == 0
+            D[exact] = 1
+            C = w / D
+            ps = (C @ y) / C.sum(axis=1)
+            
+            # At a node the formula is 0 / 0; use the node value instead.
+            i, j = np.nonzero(exact)
+            ps[i] = y[j]
+            p[s:s + step] = ps
+        
+        p = p.reshape(x.shape)
+        return p if p.ndim else p[()]
+
+    def __call__(self, x, chunk=2**20):
+        """
+        Evaluate the interpolant.
+
+        Parameters:
+        ----------
+        x : float or numpy.ndarray
+            The points at which to evaluate.
+        chunk : int, optional
+            The maximum size of the (points, nodes) temporaries (default is 2**20).
+
+        Returns:
+        -------
+        float or numpy.ndarray
+            The interpolant at x.
+        """
+        return self._evaluate(x, self.w, self.y, self.x, chunk)
+
+    def error_estimate(self, x, chunk=2**20):
+        """
+        Estimate the interpolation error a posteriori.
+
+        The estimate is the difference between the interpolant and the one
+        through every other node in sorted order. It measures the error of the
+        coarser interpolant, so it is a conservative estimate for smooth functions.
+        The coarse weights are computed once and kept until a node is added.
+
+        Parameters:
+        ----------
+        x : float or numpy.ndarray
+            The points at which to estimate the error.
+        chunk : int, optional
+            The maximum size of the (points, nodes) temporaries (default is 2**20).
+
+        Returns:
+        -------
+        float or numpy.ndarray
+            The estimated absolute error at x.
+        """
+        if len(self.x) < 3:
+            raise ValueError("At least three nodes are needed to estimate the error.")
+        
+        if self._coarse is None:
+            k = np.argsort(self.x)[::2]
+            self._coarse = (_barycentric_weights(self.x[k], self._scale)[0], self.y[k], self.x[k])
+        
+        w, y, nodes = self._coarse
+        
+        return np.abs(self(x, chunk) - self._evaluate(x, w, y, nodes, chunk))
+
+if __name__ == "__main__":
+    def f(x):
+        return (x**3 - x**2 + 2*x + 1) / (3*x**2 + 2)
+
+    x = np.linspace(-4, 3, num=1000)
+    y = f(x)
+
+    plt.figure(figsize=(20, 10))
+    plt.xlim([-3, 2])
+    plt.ylim([-1.5, 1])
+    plt.plot(x, y, label='f(x)')
+
+    z = secant_method_list(f, -2, 1, 1e-10, 100)
+    print(z)
+
+    for n in range(4):
+        plt.plot(z[n][0], z[n][1], "o")
+        plt.annotate(f"z{n}", (z[n][0], z[n][1]))
+
+        x_line = [z[n][0], z[n + 1][0]]
+        y_line = [z[n][1], z[n + 1][1]]
+        plt.plot(x_line, y_line, label=f"Secant line {n}")
+
+    plt.axhline(y=0, color="black", label="y=0")
+
+    plt.xlabel("x")
+    plt.ylabel("f(x)")
+    plt.title("Function f(x) and Secant Method Approximations")
+    plt.legend()
+    plt.grid(True)
+    plt.savefig('outputimage.png')
+    plt.show()
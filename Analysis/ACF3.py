@@ -88,7 +88,8 @@ def draw_monte_carlo(Ntotal):
     plt.show()
     fig.savefig('outputimage.png')
 
-draw_monte_carlo(250)
+if __name__ == "__main__":
+    draw_monte_carlo(250)
 
 import numpy as np
 import sympy as sym
@@ -119,5 +120,6 @@ def estimate_pi_chudnovsky(n):
     pi_estimate = (12 * c)**-1
     return pi_estimate.evalf(1000)
 
-# Example usage:
-print(estimate_pi_chudnovsky(10))
+if __name__ == "__main__":
+    # Example usage:
+    print(estimate_pi_chudnovsky(10))
@@ -0,0 +1,107 @@
+import math as ma
+from collections import Counter, deque
+
+def _bucket(v):
+    """
+    Return the power of ten bucket of a non-negative value: None for 0 and math.inf if it is not finite.
+    """
+    if not ma.isfinite(v):
+        return ma.inf
+    return ma.floor(ma.log10(v)) if v > 0 else None
+
+class IterationTracer:
+    """
+    Observer for the callback argument of babylonian_square_root and secant_method.
+
+    Every iteration updates running totals and histograms, while only every
+    sample_every-th iteration state is kept, in a bounded buffer. This makes it
+    cheap enough to leave attached in production.
+
+    Parameters:
+    ----------
+    sample_every : int, optional
+        Keep one iteration state in this many (default is 1, keep all).
+    max_records : int, optional
+        The number of most recent sampled states to keep (default is 1000).
+    stop : function, optional
+        Called with each state; returning True asks the solver to stop early.
+
+    Attributes:
+    ----------
+    records : collections.deque
+        The most recent sampled iteration states.
+    iterations : collections.Counter
+        Histogram of the number of iterations per solve, bucketed by powers of two.
+    elapsed : collections.Counter
+        Histogram of the time per solve, bucketed by powers of ten in seconds.
+    residuals : collections.Counter
+        Histogram of |residual| over all iterations, bucketed by powers of ten.
+
+    Zero values are counted under None and infinite or NaN ones, as from a
+    diverging iteration, under math.inf.
+    """
+
+    def __init__(self, sample_every=1, max_records=1000, stop=None):
+        if sample_every <= 0 or max_records <= 0:
+            raise ValueError("sample_every and max_records must be positive.")
+
+        self.sample_every = sample_every
+        self.stop = stop
+        self.records = deque(maxlen=max_records)
+        self.iterations = Counter()
+        self.elapsed = Counter()
+        self.residuals = Counter()
+        self.solves = 0
+        self.total_iterations = 0
+        self.total_evaluations = 0
+        self._last = None
+
+    def __call__(self, state):
+        # Iteration 1 starts a new solve, so the previous one is complete.
+        if state["k"] == 1:
+            self._close()
+
+        self._last = state
+        self.total_iterations += 1
+
+        if self.total_iterations % self.sample_every == 0:
+            self.records.append(state)
+
+        self.residuals[_bucket(abs(state["residual"]))] += 1
+
+        return self.stop is not None and self.stop(state)
+
+    def _close(self):
+        """
+        Add the last solve to the per-solve histograms.
+        """
+        if self._last is None:
+            return
+
+        k, t = self._last["k"], self._last["elapsed"]
+        self.solves += 1
+        self.total_evaluations += self._last["evaluations"]
+        self.iterations[2**ma.ceil(ma.log2(k))] += 1
+        self.elapsed[_bucket(t)] += 1
+        self._last = None
+
+    def summary(self):
+        """
+        Return aggregate statistics over all solves observed so far.
+
+        Returns:
+        -------
+        dict
+            The number of solves, iterations and function evaluations, and the
+            iteration, elapsed time and residual histograms.
+        """
+        self._close()
+
+        return {
+            "solves": self.solves,
+            "iterations": self.total_iterations,
+            "evaluations": self.total_evaluations,
+            "iterations_histogram": dict(sorted(self.iterations.items())),
+            "elapsed_histogram": dict(self.elapsed),
+            "residual_histogram": dict(self.residuals),
+        }
@@ -0,0 +1,396 @@
+import argparse
+import ast
+import csv
+import json
+import math as ma
+import os
+import re
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, islice
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("Analysis", "Calculus", "Linear"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+# The only names and syntax an expression may use: x, the math module's public
+# names, arithmetic, comparisons, conditionals and calls to math functions.
+_MATH_NAMES = {name: getattr(ma, name) for name in dir(ma) if not name.startswith("_")}
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Call, ast.keyword,
+    ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+)
+
+def _function(expression):
+    """
+    Turn an expression in x, such as "x**3 - 2", into a function.
+
+    The expression is parsed and checked before it is compiled: only numbers,
+    x, the math module's names, arithmetic, comparisons and calls to math
+    functions are accepted. Attribute access, subscripts, lambdas and any
+    other name are rejected with a ValueError, so a job file cannot run
+    arbitrary code through it.
+    """
+    if not isinstance(expression, str):
+        raise ValueError("f must be a string expression in x.")
+
+    tree = ast.parse(expression, "<job>", "eval")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"{type(node).__name__} is not allowed in {expression!r}.")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"Only numeric constants are allowed in {expression!r}.")
+        if isinstance(node, ast.Name) and node.id != "x" and node.id not in _MATH_NAMES:
+            raise ValueError(f"Unknown name {node.id!r} in {expression!r}.")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and callable(_MATH_NAMES.get(node.func.id))):
+            raise ValueError(f"Only math functions can be called in {expression!r}.")
+
+    code = compile(tree, "<job>", "eval")
+    return lambda x: eval(code, {"__builtins__": {}}, dict(_MATH_NAMES, x=x))
+
+def _secant_method(spec):
+    from ACF2 import secant_method
+    xN, eN, N = secant_method(_function(spec["f"]), spec["x0"], spec["x1"], spec.get("tol", 1e-10), spec.get("kmax", 100))
+    return {"x": xN, "e": eN, "N": N}
+
+def _babylonian_square_root(spec):
+    from ACF1 import babylonian_square_root
+    x, n = babylonian_square_root(spec["a"], spec.get("e", 1e-10), spec.get("x0", 1.0))
+    return {"x": x, "N": n}
+
+def _gauss_elimination(spec):
+    from LIN2 import gauss_elimination
+    return gauss_elimination(np.array(spec["A"], dtype=np.float64)).tolist()
+
+def _pn(spec):
+    from CAL1 import pn
+    return np.asarray(pn(spec["n"], np.asarray(spec["x"], dtype=float))).tolist()
+
+def _evalFn(spec):
+    from CAL3 import evalFn
+    x, y = spec["x"], spec["y"]
+    if isinstance(x, list):
+        return evalFn(spec["n"], np.array(x, dtype=float), np.array(y, dtype=float)).tolist()
+    return evalFn(spec["n"], x, y)
+
+JOBS = {
+    "secant_method": _secant_method,
+    "babylonian_square_root": _babylonian_square_root,
+    "gauss_elimination": _gauss_elimination,
+    "pn": _pn,
+    "evalFn": _evalFn,
+}
+
+def run_jobs(specs):
+    """
+    Run a batch of job specs in a worker, returning one result record per spec.
+
+    A job that raises is reported with its error rather than failing the batch.
+    """
+    records = []
+
+    for spec in specs:
+        record = {"id": spec.get("id"), "job": spec.get("job")}
+        if "_error" in spec:
+            # The job could not be read from the input file.
+            record["error"] = spec["_error"]
+            records.append(record)
+            continue
+        try:
+            if spec.get("job") not in JOBS:
+                raise ValueError(f"Unknown job {spec.get('job')!r}.")
+            record["result"] = JOBS[spec["job"]](spec)
+        except Exception as error:
+            record["error"] = f"{type(error).__name__}: {error}"
+        records.append(record)
+
+    return records
+
+# The characters the array scanner stops at: between elements, brackets,
+# braces, quotes and commas; inside an element, commas can be skipped; inside a
+# string, only the closing quote and escapes matter.
+_TOP_LEVEL = re.compile(r'[\[\]{}",]')
+_NESTED = re.compile(r'[\[\]{}"]')
+_STRING = re.compile(r'["\\]')
+
+def read_json(file, size=2**16):
+    """
+    Stream the objects of a JSON file, either one per line or inside a top-level array.
+
+    Only a block of the file and the object being read are held in memory. A
+    record that is not valid JSON is yielded as its json.JSONDecodeError, so
+    the caller can report it and carry on with the next one.
+    """
+    # The first non-blank character tells the two layouts apart.
+    first = file.read(1)
+    while first and first.isspace():
+        first = file.read(1)
+
+    if first == "[":
+        yield from _read_json_array(file, size)
+        return
+
+    lines = chain([first + file.readline()], file) if first else ()
+    for line in lines:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                yield error
+
+def _read_json_array(file, size):
+    """
+    Stream the elements of a top-level JSON array whose opening bracket has been read.
+
+    The buffer is scanned once: the scan position and nesting depth are kept
+    between reads, so each character is looked at once however large the
+    element, and every complete element is decoded on its own.
+    """
+    buffer = ""
+    start = pos = 0
+    depth = 0
+    in_string = False
+    eof = False
+
+    while True:
+        if in_string:
+            match = _STRING.search(buffer, pos)
+        elif depth > 0:
+            match = _NESTED.search(buffer, pos)
+        else:
+            match = _TOP_LEVEL.search(buffer, pos)
+
+        # A match at the very end may be an escape whose next character is still unread.
+        if match is None or (match.group() == "\\" and match.end() == len(buffer) and not eof):
+            if eof:
+                if buffer[start:].strip():
+                    yield json.JSONDecodeError("Unterminated array element", buffer, start)
+                return
+            pos = match.start() if match is not None else len(buffer)
+
+            # Drop the elements already yielded before reading the next block. The
+            # block grows with the element being read, so a large element is
+            # copied a bounded number of times.
+            block = file.read(max(size, len(buffer) - start))
+            eof = not block
+            buffer = buffer[start:] + block
+            pos -= start
+            start = 0
+            continue
+
+        char = match.group()
+        pos = match.end()
+
+        if in_string:
+            if char == "\\":
+                pos += 1
+            else:
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "[{":
+            depth += 1
+        elif depth > 0 and char in "]}":
+            depth -= 1
+        elif depth == 0 and char in ",]":
+            element = buffer[start:pos - 1]
+            if element.strip():
+                try:
+                    yield json.loads(element)
+                except json.JSONDecodeError as error:
+                    yield error
+            if char == "]":
+                return
+            start = pos
+
+def read_csv(file):
+    """
+    Stream the rows of a CSV file with a header row, decoding JSON cell values.
+
+    Cells that are not valid JSON, such as "x**3 - 2", are kept as strings.
+    """
+    for row in csv.DictReader(file):
+        spec = {}
+        for key, value in row.items():
+            try:
+                spec[key] = json.loads(value)
+            except (TypeError, ValueError):
+                spec[key] = value
+        yield spec
+
+def _job(i, spec):
+    """
+    Turn an item read from the job file into a job spec, named by its position if it has no id.
+
+    Items that could not be decoded, or are not objects, become specs that
+    run_jobs reports as errors.
+    """
+    if isinstance(spec, json.JSONDecodeError):
+        return {"id": i, "_error": f"JSONDecodeError: {spec}"}
+    if not isinstance(spec, dict):
+        return {"id": i, "_error": f"TypeError: a job must be an object, not {type(spec).__name__}."}
+    return {"id": i, **spec}
+
+def completed_count(path):
+    """
+    Count the complete result lines in an earlier output file, dropping a partial last line.
+
+    Returns:
+    -------
+    tuple
+        count : int
+            The number of complete result lines.
+        last_id : object
+            The id of the last complete result, or None if there is none.
+    """
+    if not os.path.exists(path):
+        return 0, None
+
+    count = 0
+    end = 0
+    last = None
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            count += 1
+            end += len(line)
+            last = line
+
+    with open(path, "r+b") as file:
+        file.truncate(end)
+
+    try:
+        last_id = json.loads(last)["id"] if last is not None else None
+    except (ValueError, TypeError, KeyError):
+        raise ValueError(f"{path} does not look like the output of an earlier run.") from None
+
+    return count, last_id
+
+def run_batch(input_path, output_path, workers=None, batch_size=16, max_in_flight=None, checkpoint_every=100, resume=True):
+    """
+    Run every job in a JSON or CSV file and write the results as NDJSON.
+
+    Jobs are read lazily and sent to a process pool in batches, with at most
+    max_in_flight batches running or waiting to be written. Results are
+    written in input order, so the output file doubles as the checkpoint: it is
+    flushed to disk every checkpoint_every results, and a resumed run skips as
+    many jobs as there are complete lines in it. Before resuming, the id of the
+    last line is checked against the id of the matching job in input_path, so
+    an output file from a different job file is not appended to.
+
+    Parameters:
+    ----------
+    input_path : str
+        The job file; .csv files are read as CSV, anything else as JSON.
+    output_path : str
+        The NDJSON file to write results to.
+    workers : int, optional
+        The number of worker processes (default is the number of CPUs).
+    batch_size : int, optional
+        The number of jobs sent to a worker at a time (default is 16).
+    max_in_flight : int, optional
+        The maximum number of batches running or waiting to be written (default is 4 per worker).
+    checkpoint_every : int, optional
+        The number of results between flushes to disk (default is 100).
+    resume : bool, optional
+        If True, continue after the results already in output_path (default is True).
+
+    Returns:
+    -------
+    int
+        The number of jobs run.
+
+    Raises:
+    ------
+    ValueError
+        If resume is True and output_path holds results for a different job file.
+    """
+    if batch_size <= 0 or checkpoint_every <= 0:
+        raise ValueError("batch_size and checkpoint_every must be positive.")
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or 4 * workers
+    done, last_id = completed_count(output_path) if resume else (0, None)
+
+    with open(input_path, newline="") as source, open(output_path, "a" if resume else "w") as out:
+        specs = read_csv(source) if input_path.endswith(".csv") else read_json(source)
+
+        specs = (_job(i, spec) for i, spec in enumerate(specs))
+
+        if done:
+            # The last result written must belong to job done - 1 of this input.
+            last = next(islice(specs, done - 1, None), None)
+            if last is None or last.get("id") != last_id:
+                raise ValueError(
+                    f"{output_path} holds {done} results that do not match the jobs in {input_path}; "
+                    "use another output file or start again with resume=False (--restart)."
+                )
+
+        pending = {}
+        ready = {}
+        submitted = written = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                # Finished batches waiting for an earlier one still count, so a
+                # slow job stalls the reader instead of buffering the whole file.
+                while len(pending) + len(ready) < max_in_flight:
+                    batch = list(islice(specs, batch_size))
+                    if not batch:
+                        break
+                    pending[pool.submit(run_jobs, batch)] = submitted
+                    submitted += 1
+
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    ready[pending.pop(future)] = future.result()
+
+                # Write the batches that are next in input order.
+                while written in ready:
+                    for record in ready.pop(written):
+                        out.write(json.dumps(record) + "\n")
+                        done += 1
+                        if done % checkpoint_every == 0:
+                            out.flush()
+                            os.fsync(out.fileno())
+                    written += 1
+
+            out.flush()
+
+    return done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run batches of coursework routines from a JSON or CSV job file.",
+        epilog="Expressions in f may only use x, numbers, arithmetic and math functions. "
+        "They cannot run other code, but one such as 9**9**9 can still run for a very long time, "
+        "so only run job files from sources you trust.",
+    )
+    parser.add_argument("input", help="job file, JSON (one object per line or an array) or CSV")
+    parser.add_argument("output", help="NDJSON file for the results")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--batch-size", type=int, default=16, help="jobs sent to a worker at a time")
+    parser.add_argument("--max-in-flight", type=int, help="maximum outstanding batches")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="results between flushes to disk")
+    parser.add_argument("--restart", action="store_true", help="ignore earlier results and start again")
+    args = parser.parse_args(argv)
+
+    try:
+        n = run_batch(args.input, args.output, args.workers, args.batch_size, args.max_in_flight, args.checkpoint_every, not args.restart)
+    except ValueError as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    print(f"{n} jobs complete.", file=sys.stderr)
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
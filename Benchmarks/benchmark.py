@@ -0,0 +1,232 @@
+import argparse
+import json
+import math as ma
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+# The coursework modules live in one directory per topic.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for directory in ("Analysis", "Calculus", "Linear"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+import ACF1
+import ACF2
+import ACF3
+import CAL1
+import CAL3
+import LIN2
+import LIN3
+
+def _gauss_elimination(n):
+    A = np.random.default_rng(0).uniform(-1, 1, (n, n + 1))
+    return lambda: LIN2.gauss_elimination(A.copy())
+
+def _gram_schmidt_np(n):
+    V = list(np.random.default_rng(0).uniform(-1, 1, (n, n)))
+    return lambda: LIN3.gram_schmidt_np(V)
+
+def _secant_method(n):
+    # n independent root-finding problems, one per shifted cubic.
+    shifts = np.linspace(1, 2, n).tolist()
+    return lambda: [ACF2.secant_method(lambda x: x**3 - c, 1.0, 2.0, 1e-12, 100) for c in shifts]
+
+def _babylonian_square_root(n):
+    # Starting from x0 = 1, the number of iterations grows like log(n).
+    return lambda: ACF1.babylonian_square_root(float(n), 1e-8 * n, 1.0)
+
+def _estimate_pi_monte_carlo(n):
+    return lambda: ACF3.estimate_pi_monte_carlo(n)
+
+def _estimate_pi_chudnovsky(n):
+    # Each term of the series adds about 14 digits.
+    return lambda: ACF3.estimate_pi_chudnovsky(ma.ceil(n / 14))
+
+def _evalFn(n):
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(-1, 1, n), rng.uniform(-1, 1, n)
+    return lambda: CAL3.evalFn(50, x, y)
+
+def _bernoulli(n):
+    # Start from an empty table so the whole table up to n is built.
+    def run():
+        CAL1._bernoulli_table.clear()
+        return CAL1.bernoulli(n)
+    return run
+
+def _pn(n):
+    x = np.linspace(-1, 1, 10**5)
+    CAL1.pn_coefficients(n)
+    return lambda: CAL1.pn(n, x)
+
+# Each case maps a size to a function of no arguments to time, with the sizes
+# used by default and with --full.
+CASES = {
+    "gauss_elimination": (_gauss_elimination, [10, 20, 50, 100, 200], [10, 20, 50, 100, 200, 500, 1000, 2000]),
+    "gram_schmidt_np": (_gram_schmidt_np, [10, 20, 50, 100], [10, 20, 50, 100, 200, 500]),
+    "secant_method": (_secant_method, [10, 100, 1000], [10, 100, 1000, 10000]),
+    "babylonian_square_root": (_babylonian_square_root, [10**2, 10**4, 10**8], [10**2, 10**4, 10**8, 10**16, 10**32]),
+    "estimate_pi_monte_carlo": (_estimate_pi_monte_carlo, [10**3, 10**4, 10**5], [10**3, 10**4, 10**5, 10**6, 10**7, 10**8]),
+    "estimate_pi_chudnovsky": (_estimate_pi_chudnovsky, [100, 200, 500], [100, 200, 500, 1000]),
+    "evalFn": (_evalFn, [10**3, 10**4, 10**5], [10**3, 10**4, 10**5, 10**6, 10**7]),
+    "bernoulli": (_bernoulli, [20, 50, 100], [20, 50, 100, 200, 500]),
+    "pn": (_pn, [5, 10, 20, 40], [5, 10, 20, 40, 100, 250]),
+}
+
+def measure(run, repeat):
+    """
+    Time a function and record its peak memory.
+
+    Parameters:
+    ----------
+    run : function
+        The function of no arguments to measure.
+    repeat : int
+        The number of timed runs; the fastest is kept. Runs taking over a
+        second are not repeated.
+
+    Returns:
+    -------
+    tuple
+        t : float
+            The fastest time in seconds.
+        peak : int
+            The peak memory allocated during one run, in bytes.
+    """
+    t = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        t = min(t, time.perf_counter() - start)
+        if t > 1:
+            break
+
+    # Memory is traced in a separate run since tracing slows the code down.
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return t, peak
+
+def fit_exponent(sizes, values):
+    """
+    Fit values ~ C * sizes**p by least squares on a log-log scale and return p.
+    """
+    sizes, values = np.asarray(sizes, dtype=float), np.asarray(values, dtype=float)
+    keep = values > 0
+    if keep.sum() < 2:
+        return 0.0
+    return float(np.polyfit(np.log(sizes[keep]), np.log(values[keep]), 1)[0])
+
+def run_benchmarks(names, full=False, repeat=3):
+    """
+    Run the benchmark cases and collect their scaling curves.
+
+    Parameters:
+    ----------
+    names : list of str
+        The cases to run, keys of CASES.
+    full : bool, optional
+        If True, use the full range of sizes (default is False).
+    repeat : int, optional
+        The number of timed runs per size (default is 3).
+
+    Returns:
+    -------
+    dict
+        For each case, the sizes, times, peak memory and fitted exponents.
+    """
+    results = {}
+
+    for name in names:
+        make, quick_sizes, full_sizes = CASES[name]
+        sizes = full_sizes if full else quick_sizes
+        times, peaks = [], []
+
+        for n in sizes:
+            t, peak = measure(make(n), repeat)
+            times.append(t)
+            peaks.append(peak)
+            print(f"{name:24s} n={n:<12d} time={t:.3e}s peak={peak / 2**20:.2f}MiB", file=sys.stderr)
+
+        results[name] = {
+            "sizes": sizes,
+            "time": times,
+            "peak_memory": peaks,
+            "time_exponent": fit_exponent(sizes, times),
+            "memory_exponent": fit_exponent(sizes, peaks),
+        }
+
+    return results
+
+def compare(results, baseline, time_threshold, memory_threshold, exponent_threshold):
+    """
+    Compare results with a baseline and list every metric that regressed.
+
+    A time or peak memory regresses when it exceeds the baseline value at the
+    same size by more than the given fraction; a fitted exponent regresses
+    when it exceeds the baseline exponent by more than exponent_threshold.
+
+    Returns:
+    -------
+    list of str
+        A description of each regression.
+    """
+    failures = []
+
+    for name, r in results.items():
+        if name not in baseline:
+            continue
+        b = baseline[name]
+
+        for metric, threshold in (("time", time_threshold), ("peak_memory", memory_threshold)):
+            old = dict(zip(b["sizes"], b[metric]))
+            for n, value in zip(r["sizes"], r[metric]):
+                if n in old and value > old[n] * (1 + threshold):
+                    failures.append(f"{name} {metric} at n={n}: {value:.4g} > {old[n]:.4g} (+{threshold:.0%})")
+
+        for metric in ("time_exponent", "memory_exponent"):
+            if r[metric] > b[metric] + exponent_threshold:
+                failures.append(f"{name} {metric}: {r[metric]:.3f} > {b[metric]:.3f} + {exponent_threshold}")
+
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the coursework routines and check for regressions.")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma separated cases to run")
+    parser.add_argument("--full", action="store_true", help="use the full range of sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per size")
+    parser.add_argument("--output", default="benchmark.json", help="where to write the results")
+    parser.add_argument("--baseline", help="results of an earlier run to compare with")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="allowed fractional increase in time")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="allowed fractional increase in peak memory")
+    parser.add_argument("--exponent-threshold", type=float, default=0.2, help="allowed increase in fitted exponents")
+    args = parser.parse_args(argv)
+
+    names = args.cases.split(",")
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    results = run_benchmarks(names, args.full, args.repeat)
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        failures = compare(results, baseline, args.time_threshold, args.memory_threshold, args.exponent_threshold)
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        if failures:
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
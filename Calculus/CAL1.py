@@ -1,29 +1,140 @@
 import math as ma
+from fractions import Fraction
+import numpy as np
 import pylab as pl
 import matplotlib.pyplot as plt
 
-def bernoulli(m):
+# Cached Bernoulli numbers B_0, B_1, ...
+_bernoulli_table = []
+
+def _tangent_numbers(n):
+    """
+    Return the tangent numbers T_1, ..., T_n, the integers with tan(x) = sum T_k x^(2k - 1) / (2k - 1)!.
+
+    Uses the Brent-Harvey (Seidel) recurrence, which needs O(n^2) operations
+    on integers only.
+    """
+    T = [0] * (n + 1)
+    if n == 0:
+        return T[1:]
+    
+    T[1] = 1
+    for k in range(2, n + 1):
+        T[k] = (k - 1) * T[k - 1]
+    for k in range(2, n + 1):
+        for j in range(k, n + 1):
+            T[j] = (j - k) * T[j - 1] + (j - k + 2) * T[j]
+    
+    return T[1:]
+
+def bernoulli_table(m):
+    """
+    Return the exact Bernoulli numbers B_0, ..., B_m, extending the cached table if needed.
+
+    Parameters:
+    ----------
+    m : int
+        The highest order required, must be a non-negative integer.
+
+    Returns:
+    -------
+    list of fractions.Fraction
+        The Bernoulli numbers B_0, ..., B_m (with the convention B_1 = -1/2).
+    """
+    if not isinstance(m, int) or m < 0:
+        raise ValueError("m must be a non-negative integer.")
+    
+    if m >= len(_bernoulli_table):
+        # The table is rebuilt rather than extended, so it at least doubles to
+        # keep the cost of growing it one order at a time O(m^2) overall.
+        M = max(m, 2 * len(_bernoulli_table))
+        
+        # B_2k = (-1)^(k - 1) 2k T_k / (4^k (4^k - 1)), and B_m = 0 for odd m > 1,
+        # so only the integer tangent numbers are computed.
+        T = _tangent_numbers(M // 2)
+        B = [Fraction(1), Fraction(-1, 2)]
+        for k in range(1, M // 2 + 1):
+            B.append(Fraction((-1)**(k - 1) * 2 * k * T[k - 1], 4**k * (4**k - 1)))
+            B.append(Fraction(0))
+        _bernoulli_table[:] = B[:M + 1]
+    
+    return _bernoulli_table[:m + 1]
+
+def bernoulli(m, exact=False):
     """
     Calculate the mth Bernoulli number.
 
     Parameters:
     ----------
     m : int
-        The order of the Bernoulli number, must be an integer such that 0 ≤ m ≤ 12.
+        The order of the Bernoulli number, must be a non-negative integer.
+    exact : bool, optional
+        If True, return the exact value as a fractions.Fraction (default is False).
+        Use this for m >= 260, where |B_m| is too large for a float.
 
     Returns:
     -------
-    float
+    float or fractions.Fraction
         The mth Bernoulli number.
+
+    Raises:
+    ------
+    ValueError
+        If exact is False and B_m is outside the float range.
     """
-    Bm = 0
+    if not isinstance(m, int) or m < 0:
+        raise ValueError("m must be a non-negative integer.")
+    
+    if m >= len(_bernoulli_table):
+        bernoulli_table(m)
     
-    # The double summation Bernoulli number formula for the mth Bernoulli number.
-    for k in range(m + 1):
-        for v in range(k + 1):
-            Bm += (-1)**v * (v**m / (k + 1)) * ma.comb(k, v)
+    Bm = _bernoulli_table[m]
     
-    return Bm
+    if exact:
+        return Bm
+    
+    try:
+        return float(Bm)
+    except OverflowError:
+        raise ValueError(f"B_{m} is outside the float range; use bernoulli(m, exact=True).") from None
+
+# Cached Taylor coefficients c_k = B_2k / (2k)! * (-4)^k * (1 - 4^k) of the pn series.
+_pn_coefficients = np.zeros(0)
+
+def pn_coefficients(n):
+    """
+    Return the coefficients c_1, ..., c_n of the pn series, extending the cached table if needed.
+
+    Parameters:
+    ----------
+    n : int
+        The highest order required, must be a non-negative integer.
+
+    Returns:
+    -------
+    numpy.ndarray
+        The coefficients c_1, ..., c_n such that pn(n, x) = sum c_k x^(2k - 1),
+        a read-only view of the cache.
+    """
+    global _pn_coefficients
+    
+    if not isinstance(n, int) or n < 0:
+        raise ValueError("n must be a non-negative integer.")
+    
+    m = len(_pn_coefficients)
+    
+    if n > m:
+        B = bernoulli_table(2 * n)
+        
+        # Each coefficient is formed exactly before rounding, so the large
+        # Bernoulli numbers and factorials never overflow a float.
+        c = [float(B[2 * k] / ma.factorial(2 * k) * (-4)**k * (1 - 4**k)) for k in range(m + 1, n + 1)]
+        _pn_coefficients = np.concatenate((_pn_coefficients, c))
+        
+        # The returned views share the cache, so callers must not be able to change it.
+        _pn_coefficients.flags.writeable = False
+    
+    return _pn_coefficients[:n]
 
 def pn(n, x):
     """
@@ -33,54 +144,72 @@ def pn(n, x):
     ----------
     n : int
         The order of the pn function.
-    x : float
+    x : float or numpy.ndarray
         The variable x in the pn function.
 
     Returns:
     -------
-    float
+    float or numpy.ndarray
         The value of the pn function.
     """
-    ans = 0
+    c = pn_coefficients(n)
     
-    for k in range(1, n + 1):
-        ans += (bernoulli(2 * k) / ma.factorial(2 * k)) * (-4)**k * (1 - 4**k) * x**(2 * k - 1)
+    if n == 0:
+        return 0 * x
     
-    return ans
+    x2 = x * x
+    ans = c[n - 1]
+    
+    # Horner's scheme in x^2, followed by the single odd power of x.
+    for k in range(n - 2, -1, -1):
+        ans = ans * x2 + c[k]
+    
+    return ans * x
 
-def pn(n, x):
+def pn_partial_sums(n, x):
     """
-    Calculate the pn function using Bernoulli numbers.
+    Calculate p_1(x), ..., p_n(x) in a single pass over the series.
 
     Parameters:
     ----------
     n : int
-        The order of the pn function.
-    x : float
+        The highest order of the pn function.
+    x : float or numpy.ndarray
         The variable x in the pn function.
 
     Returns:
     -------
-    float
-        The value of the pn function.
+    numpy.ndarray
+        An array of shape (n, len(x)) whose row k - 1 holds p_k(x).
     """
-    ans = 0
+    c = pn_coefficients(n)
+    x = np.asarray(x, dtype=float)
+    x2 = x * x
     
-    for k in range(1, n + 1):
-        ans += (bernoulli(2 * k) / ma.factorial(2 * k)) * (-4)**k * (1 - 4**k) * x**(2 * k - 1)
+    P = np.empty((n,) + x.shape)
+    term = x.copy()
+    ans = np.zeros_like(x)
     
-    return ans
+    for k in range(n):
+        ans += c[k] * term
+        P[k] = ans
+        term *= x2
+    
+    return P
+
+if __name__ == "__main__":
+    x = pl.linspace(-ma.pi / 3, ma.pi / 3, num=1000)
 
-x = pl.linspace(-ma.pi / 3, ma.pi / 3, num=1000)
+    plt.plot(x, pl.tan(x), label="tan(x)")
 
-plt.plot(x, pl.tan(x), label="tan(x)")
+    P = pn_partial_sums(3, x)
 
-for n in range(1, 4):
-    plt.plot(x, pn(n, x), label=f"$p_{n}(x)$")
+    for n in range(1, 4):
+        plt.plot(x, P[n - 1], label=f"$p_{n}(x)$")
 
-plt.legend()
-plt.xlabel("x")
-plt.ylabel("y")
-plt.title("Approximation of tan(x) using Bernoulli Polynomials")
-plt.grid(True)
-plt.show()
+    plt.legend()
+    plt.xlabel("x")
+    plt.ylabel("y")
+    plt.title("Approximation of tan(x) using Bernoulli Polynomials")
+    plt.grid(True)
+    plt.show()
@@ -1,18 +1,475 @@
+import math as ma
 import numpy as np
 import matplotlib.pyplot as plt
+from collections import deque
+
+# Results of evaluate_grid, keyed by function and grid specification, oldest
+# first. Stored arrays are read-only and their total size is bounded in bytes.
+_grid_cache = {}
+_grid_cache_bytes = 2**28
+
+def evaluate_grid(f, xlim, ylim, nx, ny, dtype=np.float64, tile=512, out=None, cache=False):
+    """
+    Evaluate f(x, y) on a uniform grid, one tile at a time.
+
+    Only one-dimensional x and y axes are created; each tile broadcasts a row
+    of x against a column of y, so the temporaries created by f are at most
+    tile x tile in size regardless of the size of the grid.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of two arrays.
+    xlim : tuple
+        The interval (xmin, xmax) sampled by the grid.
+    ylim : tuple
+        The interval (ymin, ymax) sampled by the grid.
+    nx : int
+        Number of grid points in x.
+    ny : int
+        Number of grid points in y.
+    dtype : numpy.dtype, optional
+        The floating point type of the grid and result (default is float64).
+    tile : int, optional
+        The side length of each tile (default is 512).
+    out : numpy.ndarray, optional
+        A preallocated (ny, nx) array of type dtype to write the result into.
+    cache : bool, optional
+        Whether to reuse and store results for the same f and grid (default is False).
+        Cached results are read-only; at most 256 MiB of them are kept, oldest
+        dropped first, and larger grids are never cached. A buffer passed as
+        out is copied into the cache, never stored itself.
+
+    Returns:
+    -------
+    tuple
+        x : numpy.ndarray
+            The grid points in x, of length nx.
+        y : numpy.ndarray
+            The grid points in y, of length ny.
+        Z : numpy.ndarray
+            The (ny, nx) array with Z[i, j] = f(x[j], y[i]), as from np.meshgrid.
+    """
+    if nx <= 0 or ny <= 0 or tile <= 0:
+        raise ValueError("nx, ny and tile must be positive.")
+    dtype = np.dtype(dtype)
+    
+    if out is not None and out.shape != (ny, nx):
+        raise ValueError("out must have shape (ny, nx).")
+    if out is not None and out.dtype != dtype:
+        raise ValueError(f"out must have dtype {dtype}, not {out.dtype}.")
+    
+    key = (f, tuple(xlim), tuple(ylim), nx, ny, dtype.str)
+    
+    x = np.linspace(xlim[0], xlim[1], nx, dtype=dtype)
+    y = np.linspace(ylim[0], ylim[1], ny, dtype=dtype)
+    
+    if cache and key in _grid_cache:
+        if out is None:
+            return x, y, _grid_cache[key]
+        out[...] = _grid_cache[key]
+        return x, y, out
+    
+    caller_buffer = out is not None
+    if out is None:
+        out = np.empty((ny, nx), dtype=dtype)
+    
+    for i in range(0, ny, tile):
+        yi = y[i:i + tile, np.newaxis]
+        for j in range(0, nx, tile):
+            out[i:i + tile, j:j + tile] = f(x[np.newaxis, j:j + tile], yi)
+    
+    if cache and out.nbytes <= _grid_cache_bytes:
+        stored = out.copy() if caller_buffer else out
+        stored.flags.writeable = False
+        
+        while sum(Z.nbytes for Z in _grid_cache.values()) + stored.nbytes > _grid_cache_bytes:
+            del _grid_cache[next(iter(_grid_cache))]
+        _grid_cache[key] = stored
+    
+    return x, y, out
+
+def level_curves(f, xlim, ylim, levels, n0=16, max_depth=6, tol=0.1):
+    """
+    Extract the level curves of f(x, y) by marching squares on an adaptive quadtree.
+
+    The domain starts as an n0 x n0 grid of cells. A cell is split into four
+    while one of the levels lies between the smallest and largest of its corner
+    and centre values. A cell whose centre value differs from the mean of its
+    corners by more than tol times a scale of f may hide a level, so it is split
+    once more to probe it; its children are kept only if a level crosses them.
+    The scale is the smaller of the range of the initial samples and the
+    smallest spacing between levels, so the refinement does not depend on the
+    units of f. Cells that are not kept contain no curve and are dropped, so f
+    is only sampled densely near the level curves.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of two arrays.
+    xlim : tuple
+        The interval (xmin, xmax) of the domain.
+    ylim : tuple
+        The interval (ymin, ymax) of the domain.
+    levels : float or array_like
+        The levels to extract.
+    n0 : int, optional
+        Number of cells per side of the initial grid (default is 16).
+    max_depth : int, optional
+        Maximum number of times a cell is split (default is 6).
+    tol : float, optional
+        Largest allowed deviation of the centre value from the corner mean,
+        relative to the scale of f described above (default is 0.1).
+
+    Returns:
+    -------
+    dict
+        Maps each level to a list of polylines, each an (m, 2) array of (x, y) points.
+        Closed curves have equal first and last points.
+    """
+    if n0 <= 0 or max_depth < 0:
+        raise ValueError("n0 must be positive and max_depth non-negative.")
+    
+    levels = np.sort(np.atleast_1d(np.asarray(levels, dtype=float)))
+    
+    # Points are addressed by integer coordinates (i, j) on the finest lattice,
+    # stored under the key i * (N + 1) + j so that no point is evaluated twice.
+    N = n0 * 2**max_depth
+    hx = (xlim[1] - xlim[0]) / N
+    hy = (ylim[1] - ylim[0]) / N
+    values = {}
+    
+    def sample(I, J):
+        K = np.unique(I * (N + 1) + J)
+        K = K[[k not in values for k in K.tolist()]]
+        if K.size:
+            z = np.broadcast_to(f(xlim[0] + (K // (N + 1)) * hx, ylim[0] + (K % (N + 1)) * hy), K.shape)
+            values.update(zip(K.tolist(), z.tolist()))
+    
+    def lookup(I, J):
+        K = (I * (N + 1) + J).ravel().tolist()
+        return np.fromiter(map(values.__getitem__, K), float, count=len(K)).reshape(I.shape)
+    
+    def corners(I, J, size):
+        return np.stack([I, I + size, I + size, I]), np.stack([J, J, J + size, J + size])
+    
+    size = 2**max_depth
+    I, J = np.meshgrid(np.arange(n0) * size, np.arange(n0) * size, indexing='ij')
+    I, J = I.ravel(), J.ravel()
+    probe = np.zeros(I.size, dtype=bool)
+    threshold = None
+    
+    while size > 1 and I.size:
+        half = size // 2
+        CI, CJ = corners(I, J, size)
+        sample(np.concatenate([CI.ravel(), I + half]), np.concatenate([CJ.ravel(), J + half]))
+        
+        V = lookup(CI, CJ)
+        C = lookup(I + half, J + half)
+        lo = np.minimum(V.min(axis=0), C)
+        hi = np.maximum(V.max(axis=0), C)
+        
+        if threshold is None:
+            scale = max(hi.max(), C.max()) - min(lo.min(), C.min())
+            if len(levels) > 1 and np.diff(levels).min() > 0:
+                scale = min(scale, np.diff(levels).min())
+            threshold = tol * scale
+        
+        crosses = np.searchsorted(levels, lo) < np.searchsorted(levels, hi, side='right')
+        curved = ~probe & (np.abs(C - V.mean(axis=0)) > threshold)
+        keep = crosses | curved
+        
+        I, J, probe = I[keep], J[keep], (curved & ~crosses)[keep]
+        I = np.concatenate([I, I + half, I, I + half])
+        J = np.concatenate([J, J, J + half, J + half])
+        probe = np.tile(probe, 4)
+        size = half
+    
+    CI, CJ = corners(I, J, size)
+    sample(CI.ravel(), CJ.ravel())
+    V = lookup(CI, CJ)
+    
+    # Edge k joins corner k to corner k + 1. Each edge is keyed by its lower-left
+    # end point and its direction, so neighbouring cells agree on shared edges.
+    K0 = I * (N + 1) + J
+    edge_keys = np.stack([2 * K0, 2 * (K0 + N + 1) + 1, 2 * (K0 + 1), 2 * K0 + 1])
+    cols = np.arange(I.size)
+    
+    curves = {}
+    for c in levels:
+        A = V >= c
+        crossed = A != np.roll(A, -1, axis=0)
+        
+        Vb = np.roll(V, -1, axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(crossed, (c - V) / (Vb - V), 0)
+        px = xlim[0] + (CI + t * (np.roll(CI, -1, axis=0) - CI)) * hx
+        py = ylim[0] + (CJ + t * (np.roll(CJ, -1, axis=0) - CJ)) * hy
+        points = dict(zip(edge_keys[crossed].tolist(), zip(px[crossed].tolist(), py[crossed].tolist())))
+        
+        n = crossed.sum(axis=0)
+        
+        # Two crossed edges: one segment between them.
+        two = n == 2
+        first = crossed.argmax(axis=0)
+        last = 3 - crossed[::-1].argmax(axis=0)
+        ea = [edge_keys[first[two], cols[two]]]
+        eb = [edge_keys[last[two], cols[two]]]
+        
+        # Saddle: if the centre is on the side of corner 0, cut off corners 1
+        # and 3, otherwise cut off corners 0 and 2.
+        four = n == 4
+        same = (V.mean(axis=0) >= c) == A[0]
+        for pairs, mask in ((((0, 1), (2, 3)), four & same), (((3, 0), (1, 2)), four & ~same)):
+            for a, b in pairs:
+                ea.append(edge_keys[a, mask])
+                eb.append(edge_keys[b, mask])
+        
+        segments = list(zip(np.concatenate(ea).tolist(), np.concatenate(eb).tolist()))
+        curves[float(c)] = [np.array([points[e] for e in line]) for line in _join_segments(segments)]
+    
+    return curves
+
+def _join_segments(segments):
+    """
+    Join segments that share an endpoint into polylines.
+
+    Parameters:
+    ----------
+    segments : list of tuple
+        Each segment is a pair of hashable endpoint keys.
+
+    Returns:
+    -------
+    list of list
+        The endpoint keys of each polyline, in order.
+    """
+    ends = {}
+    for s, (a, b) in enumerate(segments):
+        ends.setdefault(a, []).append(s)
+        ends.setdefault(b, []).append(s)
+    
+    used = [False] * len(segments)
+    lines = []
+    
+    for s in range(len(segments)):
+        if used[s]:
+            continue
+        used[s] = True
+        line = deque(segments[s])
+        
+        for forward in (True, False):
+            e = line[-1] if forward else line[0]
+            while True:
+                nxt = [t for t in ends[e] if not used[t]]
+                if not nxt:
+                    break
+                used[nxt[0]] = True
+                a, b = segments[nxt[0]]
+                e = b if a == e else a
+                if forward:
+                    line.append(e)
+                else:
+                    line.appendleft(e)
+        
+        lines.append(list(line))
+    
+    return lines
+
+def fd_weights(offsets, derivative=1):
+    """
+    Compute finite difference weights for a stencil of arbitrary offsets.
+
+    Parameters:
+    ----------
+    offsets : array_like
+        The stencil points in units of the step size h, e.g. (-1, 0, 1).
+    derivative : int, optional
+        The order of the derivative to approximate (default is 1).
+
+    Returns:
+    -------
+    numpy.ndarray
+        Weights w such that sum(w[k] * f(x + offsets[k] * h)) / h**derivative
+        approximates the derivative of f at x.
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    n = len(offsets)
+    
+    if derivative < 0 or derivative >= n:
+        raise ValueError("The stencil needs more points than the derivative order.")
+    
+    # Match the Taylor expansion term by term: sum(w[k] * offsets[k]**i) = i! if i == derivative else 0.
+    A = np.vander(offsets, increasing=True).T
+    b = np.zeros(n)
+    b[derivative] = ma.factorial(derivative)
+    
+    return np.linalg.solve(A, b)
+
+def fd_stencil(derivative=1, order=2, kind='central', richardson=False):
+    """
+    Build a forward, backward or central finite difference stencil.
+
+    Parameters:
+    ----------
+    derivative : int, optional
+        The order of the derivative to approximate (default is 1).
+    order : int, optional
+        The order of accuracy in h, must be even for central stencils (default is 2).
+    kind : str, optional
+        One of 'forward', 'backward' or 'central' (default is 'central').
+    richardson : bool, optional
+        If True, combine the stencil with the same stencil at step 2h by Richardson
+        extrapolation, which removes the leading error term (default is False).
+
+    Returns:
+    -------
+    tuple
+        offsets : numpy.ndarray
+            The integer stencil points.
+        weights : numpy.ndarray
+            The corresponding weights, see fd_weights.
+        order : int
+            The order of accuracy of the stencil.
+    """
+    if derivative < 1 or order < 1:
+        raise ValueError("derivative and order must be positive.")
+    
+    if kind == 'central':
+        if order % 2:
+            raise ValueError("Central stencils must have an even order.")
+        p = (derivative - 1) // 2 + order // 2
+        offsets = np.arange(-p, p + 1)
+    elif kind == 'forward':
+        offsets = np.arange(derivative + order)
+    elif kind == 'backward':
+        offsets = -np.arange(derivative + order)[::-1]
+    else:
+        raise ValueError("kind must be 'forward', 'backward' or 'central'.")
+    
+    weights = fd_weights(offsets, derivative)
+    
+    if richardson:
+        # D(h) = D + c h^order + ..., so (2^order D(h) - D(2h)) / (2^order - 1) cancels the h^order term.
+        r = 2**order
+        wide = np.arange(2 * offsets.min(), 2 * offsets.max() + 1)
+        combined = np.zeros(len(wide))
+        combined[offsets - wide[0]] += r * weights / (r - 1)
+        combined[2 * offsets - wide[0]] -= weights / 2**derivative / (r - 1)
+        offsets, weights = wide, combined
+        order += 2 if kind == 'central' else 1
+    
+    return offsets, weights, order
+
+def finite_difference(F, h, axis=-1, derivative=1, order=2, richardson=False):
+    """
+    Differentiate uniformly sampled values along one axis of an array.
+
+    Interior points use the central stencil; the first and last few points use
+    a one-sided stencil one point wider, shifted to stay inside the array. Every point
+    is computed with whole-array operations, one per stencil offset.
+
+    Parameters:
+    ----------
+    F : numpy.ndarray
+        The sampled function values.
+    h : float
+        The grid spacing along the axis.
+    axis : int, optional
+        The axis to differentiate along (default is -1).
+    derivative : int, optional
+        The order of the derivative (default is 1).
+    order : int, optional
+        The order of accuracy of the central stencil, must be even (default is 2).
+    richardson : bool, optional
+        If True, apply Richardson extrapolation with steps h and 2h taken from
+        the same samples (default is False).
+
+    Returns:
+    -------
+    numpy.ndarray
+        The approximate derivative, with the same shape as F.
+    """
+    if h <= 0:
+        raise ValueError("Step size (h) must be positive.")
+    
+    F = np.moveaxis(np.asarray(F, dtype=float), axis, 0)
+    offsets, weights, _ = fd_stencil(derivative, order, 'central', richardson)
+    
+    m = F.shape[0]
+    p = offsets.max()
+    width = 2 * p + 1
+    
+    if m < width:
+        raise ValueError("Not enough points along the axis for the requested stencil.")
+    
+    D = np.zeros_like(F)
+    interior = D[p:m - p]
+    
+    for o, w in zip(offsets, weights):
+        if w != 0:
+            interior += w * F[p + o:m - p + o]
+    
+    # One-sided stencils lose an order against central ones, so take one extra point.
+    n = min(width + 1, m)
+    for i in range(p):
+        D[i] = np.tensordot(fd_weights(np.arange(n) - i, derivative), F[:n], axes=1)
+        D[m - 1 - i] = np.tensordot(fd_weights(np.arange(n) - (n - 1 - i), derivative), F[m - n:], axes=1)
+    
+    D /= h**derivative
+    
+    return np.moveaxis(D, 0, axis)
+
+def derivative(f, x, derivative=1, order=2, kind='central', h=None, richardson=True):
+    """
+    Differentiate a vectorised function at an array of points.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    x : float or numpy.ndarray
+        The points at which to differentiate.
+    derivative : int, optional
+        The order of the derivative (default is 1).
+    order : int, optional
+        The order of accuracy of the base stencil (default is 2).
+    kind : str, optional
+        One of 'forward', 'backward' or 'central' (default is 'central').
+    h : float or numpy.ndarray, optional
+        The step size. By default it balances truncation and rounding error,
+        h = eps**(1 / (order + derivative)) * max(1, |x|).
+    richardson : bool, optional
+        If True, apply Richardson extrapolation (default is True).
+
+    Returns:
+    -------
+    float or numpy.ndarray
+        The approximate derivative of f at x.
+    """
+    offsets, weights, p = fd_stencil(derivative, order, kind, richardson)
+    x = np.asarray(x, dtype=float)
+    
+    if h is None:
+        h = np.finfo(float).eps**(1 / (p + derivative)) * np.maximum(1, np.abs(x))
+    
+    D = sum(w * f(x + o * h) for o, w in zip(offsets, weights) if w != 0)
+    
+    return D / h**derivative
 
 def f(x, y):
     return x * y * np.exp(-2 * x**2 - y**4)
 
-x = np.linspace(-1, 1, 1000)
-y = np.linspace(-1, 1, 1000)
-
-X, Y = np.meshgrid(x, y)
-Z = f(X, Y)
+# Choose 20 levels from a coarse grid, then trace them adaptively
+x, y, Z = evaluate_grid(f, (-1, 1), (-1, 1), 64, 64)
+levels = np.linspace(Z.min(), Z.max(), 22)[1:-1]
+curves = level_curves(f, (-1, 1), (-1, 1), levels)
 
-contours = plt.contour(X, Y, Z, 20, cmap='RdGy')
-plt.colorbar()
-plt.clabel(contours, inline=True, fontsize=8)
+norm = plt.Normalize(levels[0], levels[-1])
+for c, lines in curves.items():
+    for line in lines:
+        plt.plot(line[:, 0], line[:, 1], color=plt.cm.RdGy(norm(c)))
+plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap='RdGy'), ax=plt.gca())
 
 plt.title("Level Curves of $f(x, y) = xy e^{-2x^2 - y^4}$")
 plt.xlabel("x")
@@ -29,13 +486,9 @@ def f(x, y):
 fig = plt.figure()
 ax = plt.axes(projection='3d')
 
-# Generate the x and y data
-x = np.linspace(-1, 1, 100)
-y = np.linspace(-1, 1, 100)
-
-# Create the meshgrid for the x and y data
+# Evaluate f on the grid and create the meshgrid for the surface plot
+x, y, Z = evaluate_grid(f, (-1, 1), (-1, 1), 100, 100)
 X, Y = np.meshgrid(x, y)
-Z = f(X, Y)
 
 # Plot the surface
 ax.plot_surface(X, Y, Z, rstride=1, cstride=1, cmap='hot', edgecolor='none')
@@ -50,6 +503,22 @@ ax.set_zlabel('z')
 plt.savefig('outputimage.png')
 plt.show()
 
+# Differentiate f on a grid: rows of Z follow y (axis 0) and columns follow x (axis 1)
+x, y, Z = evaluate_grid(f, (-1, 1), (-1, 1), 21, 21)
+X, Y = np.meshgrid(x, y)
+fx = finite_difference(Z, x[1] - x[0], axis=1, richardson=True)
+fy = finite_difference(Z, y[1] - y[0], axis=0, richardson=True)
+
+# Plot the gradient field
+plt.figure()
+plt.quiver(X, Y, fx, fy)
+plt.title("Gradient of $f(x, y) = xy e^{-2x^2 - y^4}$ by Central Differences")
+plt.xlabel("x")
+plt.ylabel("y")
+
+plt.savefig('outputimage.png')
+plt.show()
+
 def draw_plot(a, tmax, n):
     """
     Draw a 3D plot of a torus.
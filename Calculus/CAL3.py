@@ -1,11 +1,16 @@
 
 import numpy as np
 import sympy as sym
+from collections import OrderedDict
 
-def evalFn(n, x, y):
+def evalFn(n, x, y, out=None, dtype=None, chunk=2**16):
     """
     Evaluate the function based on the given inputs.
 
+    For arrays only the two previous terms of the recurrence are kept, in
+    buffers of at most chunk elements that are updated in place, so the
+    memory used beyond the result does not grow with n or with the input size.
+
     Parameters:
     ----------
     n : int
@@ -14,6 +19,12 @@ def evalFn(n, x, y):
         The x input values.
     y : np.ndarray or float
         The y input values.
+    out : np.ndarray, optional
+        A preallocated C-contiguous array, the shape of x and y, for the result.
+    dtype : np.dtype, optional
+        The floating point type used for arrays (default is the type of x and y, at least float64).
+    chunk : int, optional
+        The number of array elements processed at a time (default is 2**16).
 
     Returns:
     -------
@@ -23,14 +34,43 @@ def evalFn(n, x, y):
     if isinstance(x, np.ndarray) and isinstance(y, np.ndarray):
         if np.shape(x) != np.shape(y):
             raise ValueError("Shapes of x and y must be the same.")
-
-        H = [np.array([[1, 1], [1, 1], [1, 1]])]
-        H.append(x / 2 - y**2)
-
-        for i in range(1, n):
-            H.append(((2 * i * x * y) * H[i] - (2 * i + 1) * H[i - 1]) / (2 * i**2))
-
-        return H[n]
+        if chunk <= 0:
+            raise ValueError("chunk must be positive.")
+        
+        dtype = np.dtype(dtype) if dtype is not None else np.result_type(x, y, np.float64)
+        
+        if out is None:
+            out = np.empty(x.shape, dtype=dtype)
+        elif out.shape != x.shape or not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous with the same shape as x and y.")
+        
+        xf, yf, of = x.reshape(-1), y.reshape(-1), out.reshape(-1)
+        m = min(chunk, xf.size)
+        xy, prev, cur, tmp = (np.empty(m, dtype=dtype) for _ in range(4))
+        
+        for s in range(0, xf.size, chunk):
+            k = min(chunk, xf.size - s)
+            xs, ys = xf[s:s + k], yf[s:s + k]
+            H0, H1, XY, T = prev[:k], cur[:k], xy[:k], tmp[:k]
+            
+            # H[0] = 1, H[1] = x / 2 - y**2
+            H0.fill(1)
+            np.multiply(ys, ys, out=H1)
+            np.multiply(xs, 0.5, out=T)
+            np.subtract(T, H1, out=H1)
+            np.multiply(xs, ys, out=XY)
+            
+            # H[i + 1] = (x y / i) H[i] - (2 i + 1) / (2 i**2) H[i - 1], reusing the older buffer
+            for i in range(1, n):
+                np.multiply(XY, H1, out=T)
+                T *= 1 / i
+                H0 *= -(2 * i + 1) / (2 * i**2)
+                H0 += T
+                H0, H1 = H1, H0
+            
+            of[s:s + k] = H1 if n > 0 else H0
+        
+        return out
 
     elif isinstance(x, (int, float)) and isinstance(y, (int, float)):
         F = np.zeros(n + 1)
@@ -44,10 +84,18 @@ def evalFn(n, x, y):
     else:
         raise ValueError("x and y must both be either np.ndarray or both int/float.")
 
+# Polynomials F_0, F_1, ... computed by symbolicFn, per (x, y) symbol pair,
+# with the least recently used pair dropped once there are more than the limit.
+_symbolic_cache = OrderedDict()
+_symbolic_cache_size = 8
+
 def symbolicFn(n, x, y):
     """
     Evaluate the symbolic function based on the given inputs.
 
+    The recurrence is carried out on polynomials over QQ and every F_i is
+    cached, so asking for n + 1 after n costs a single recurrence step.
+
     Parameters:
     ----------
     n : int
@@ -73,19 +121,521 @@ def symbolicFn(n, x, y):
     if not (isinstance(x, sym.core.symbol.Symbol) and isinstance(y, sym.core.symbol.Symbol)):
         raise ValueError('Invalid x or y input! x and y must be sympy symbols.')
     
-    if n == 0:
-        return sym.Poly(1, x, y, domain=sym.QQ)
+    F = _symbolic_cache.get((x, y))
+    
+    if F is None:
+        R, X, Y = sym.ring([x, y], sym.QQ)
+        F = [R(1), X/2 - Y**2]
+        _symbolic_cache[(x, y)] = F
+        if len(_symbolic_cache) > _symbolic_cache_size:
+            _symbolic_cache.popitem(last=False)
+    else:
+        _symbolic_cache.move_to_end((x, y))
+    
+    # Continue the recurrence from the last cached degree on sparse polynomials in QQ[x, y].
+    xy = F[0].ring.gens[0] * F[0].ring.gens[1]
+    
+    for i in range(len(F) - 1, n):
+        F.append(xy * F[i] * sym.QQ(1, i) - F[i - 1] * sym.QQ(2*i + 1, 2*i**2))
+    
+    return sym.Poly.from_dict(dict(F[n]), x, y, domain=sym.QQ)
+
+# Numerical kernels built by compileFn, keyed by degree and dtype.
+_compiled_cache = {}
+
+def compileFn(n, dtype=np.float64, check=False):
+    """
+    Compile the polynomial from symbolicFn(n, x, y) into a vectorised numerical kernel.
+
+    Each monomial x^i y^j is written as (xy)^m x^(i - m) y^(j - m) with
+    m = min(i, j). Terms sharing the same x^a y^b factor form a polynomial in
+    u = xy, which is evaluated by Horner's scheme with coefficients rounded
+    once to dtype. Kernels are cached by (n, dtype).
+
+    Parameters:
+    ----------
+    n : int
+        The degree of the function. Must be a non-negative integer.
+    dtype : np.dtype, optional
+        The floating point type of the coefficients and result (default is float64).
+    check : bool, optional
+        If True, compare the kernel with evalFn on a grid over [-1, 1]^2 (default is False).
+
+    Returns:
+    -------
+    function
+        A function kernel(x, y, chunk=2**16) of two arrays of the same shape
+        returning the polynomial values, evaluated chunk elements at a time.
+
+    Raises:
+    ------
+    ArithmeticError
+        If check is True and the kernel disagrees with evalFn.
+    """
+    dtype = np.dtype(dtype)
+    kernel = _compiled_cache.get((n, dtype.str))
+    
+    if kernel is None:
+        X, Y = sym.symbols('x y')
+        
+        groups = {}
+        for (i, j), c in symbolicFn(n, X, Y).terms():
+            m = min(i, j)
+            groups.setdefault((i - m, j - m), {})[m] = c
+        
+        # For each x^a y^b factor: the lowest power of u, the stride g between
+        # powers of u, and the dense Horner coefficients in u^g, highest first.
+        plan = []
+        for (a, b), terms in groups.items():
+            powers = sorted(terms)
+            g = np.gcd.reduce(np.diff(powers)) if len(powers) > 1 else 1
+            coeffs = [dtype.type(float(terms.get(k, 0))) for k in range(powers[-1], powers[0] - 1, -g)]
+            plan.append((a, b, powers[0], int(g), coeffs))
+        
+        def kernel(x, y, chunk=2**16):
+            x, y = np.broadcast_arrays(np.asarray(x, dtype=dtype), np.asarray(y, dtype=dtype))
+            out = np.empty(x.shape, dtype=dtype)
+            xf, yf, of = x.reshape(-1), y.reshape(-1), out.reshape(-1)
+            
+            for s in range(0, xf.size, chunk):
+                xs, ys = xf[s:s + chunk], yf[s:s + chunk]
+                u = xs * ys
+                total = np.zeros_like(u)
+                
+                for a, b, k, g, coeffs in plan:
+                    v = u if g == 1 else u**g
+                    p = np.full_like(u, coeffs[0])
+                    for c in coeffs[1:]:
+                        p *= v
+                        p += c
+                    if k:
+                        p *= u**k
+                    if a:
+                        p *= xs**a
+                    if b:
+                        p *= ys**b
+                    total += p
+                
+                of[s:s + chunk] = total
+            
+            return out if out.ndim else out[()]
+        
+        _compiled_cache[(n, dtype.str)] = kernel
+    
+    if check:
+        x, y = np.meshgrid(np.linspace(-1, 1, 21), np.linspace(-1, 1, 21))
+        expected = evalFn(n, x, y)
+        tol = np.finfo(dtype).resolution**0.5
+        if not np.allclose(kernel(x, y), expected, rtol=tol, atol=tol * np.abs(expected).max()):
+            raise ArithmeticError("Compiled kernel does not agree with evalFn.")
+    
+    return kernel
+
+if __name__ == "__main__":
+    # Example usage:
+    x, y = sym.symbols('x y')
+    print(symbolicFn(3, x, y))
+
+def _composite_nodes(a, b, n):
+    """
+    Return n + 1 equally spaced nodes on [a, b] along a new last axis, and the spacing.
+    """
+    a = np.asarray(a, dtype=float)[..., np.newaxis]
+    b = np.asarray(b, dtype=float)[..., np.newaxis]
+    h = (b - a) / n
+    return a + h * np.arange(n + 1), h[..., 0]
+
+def trapezoid(f, a, b, n):
+    """
+    Approximate the integral of f over [a, b] by the composite trapezoidal rule.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float or np.ndarray
+        The lower limit(s) of integration.
+    b : float or np.ndarray
+        The upper limit(s) of integration; arrays of limits integrate many intervals at once.
+    n : int
+        The number of subintervals.
+
+    Returns:
+    -------
+    float or np.ndarray
+        The approximate integral(s).
+    """
+    if n <= 0:
+        raise ValueError("Number of subintervals (n) must be positive.")
+    
+    x, h = _composite_nodes(a, b, n)
+    F = f(x)
+    
+    return h * (F[..., 1:-1].sum(axis=-1) + (F[..., 0] + F[..., -1]) / 2)
+
+def midpoint(f, a, b, n):
+    """
+    Approximate the integral of f over [a, b] by the composite midpoint rule.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float or np.ndarray
+        The lower limit(s) of integration.
+    b : float or np.ndarray
+        The upper limit(s) of integration.
+    n : int
+        The number of subintervals.
+
+    Returns:
+    -------
+    float or np.ndarray
+        The approximate integral(s).
+    """
+    if n <= 0:
+        raise ValueError("Number of subintervals (n) must be positive.")
+    
+    x, h = _composite_nodes(a, b, n)
+    
+    return h * f((x[..., :-1] + x[..., 1:]) / 2).sum(axis=-1)
+
+def simpson(f, a, b, n):
+    """
+    Approximate the integral of f over [a, b] by the composite Simpson's rule.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float or np.ndarray
+        The lower limit(s) of integration.
+    b : float or np.ndarray
+        The upper limit(s) of integration.
+    n : int
+        The number of subintervals, must be even.
+
+    Returns:
+    -------
+    float or np.ndarray
+        The approximate integral(s).
+    """
+    if n <= 0 or n % 2:
+        raise ValueError("Number of subintervals (n) must be positive and even.")
+    
+    x, h = _composite_nodes(a, b, n)
+    F = f(x)
+    
+    return h / 3 * (F[..., 0] + F[..., -1] + 4 * F[..., 1:-1:2].sum(axis=-1) + 2 * F[..., 2:-1:2].sum(axis=-1))
+
+def romberg(f, a, b, tol, kmax):
+    """
+    Approximate the integral of f over [a, b] by Romberg integration.
+
+    Each level halves the trapezoidal step and evaluates f only at the new
+    midpoints, reusing every value from the previous levels.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float
+        The lower limit of integration.
+    b : float
+        The upper limit of integration.
+    tol : float
+        The tolerance for the difference between successive extrapolated values.
+    kmax : int
+        The maximum number of halvings.
+
+    Returns:
+    -------
+    tuple
+        I : float
+            The estimated integral.
+        e : float
+            The error estimate.
+        N : int
+            The number of function evaluations.
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance (tol) must be positive.")
+    if kmax <= 0:
+        raise ValueError("Maximum iterations (kmax) must be positive.")
+    
+    h = b - a
+    R = [h * (f(np.array([a, b], dtype=float)).sum()) / 2]
+    N = 2
+    
+    for k in range(1, kmax + 1):
+        h /= 2
+        m = 2**(k - 1)
+        new = f(a + h * (2 * np.arange(m) + 1))
+        N += m
+        
+        row = [R[0] / 2 + h * new.sum()]
+        for j in range(1, k + 1):
+            row.append(row[j - 1] + (row[j - 1] - R[j - 1]) / (4**j - 1))
+        
+        e = abs(row[-1] - R[-1])
+        R = row
+        
+        if e < tol:
+            return float(R[-1]), float(e), N
     
-    F = [1, x/2 - y**2]
+    raise ArithmeticError("Maximum number of iterations exceeded.")
+
+def adaptive_simpson(f, a, b, tol, kmax):
+    """
+    Approximate the integral of f over [a, b] by adaptive Simpson's rule.
+
+    Intervals whose Simpson estimate changes by more than their share of tol
+    when halved are split again; the three values of each interval are passed
+    on so every split costs two new function evaluations.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float
+        The lower limit of integration.
+    b : float
+        The upper limit of integration.
+    tol : float
+        The tolerance for the total error.
+    kmax : int
+        The maximum number of intervals to split.
+
+    Returns:
+    -------
+    tuple
+        I : float
+            The estimated integral.
+        e : float
+            The error estimate.
+        N : int
+            The number of function evaluations.
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance (tol) must be positive.")
+    if kmax <= 0:
+        raise ValueError("Maximum iterations (kmax) must be positive.")
+    
+    fa, fm, fb = f(np.array([a, (a + b) / 2, b], dtype=float))
+    stack = [(a, b, fa, fm, fb, (b - a) / 6 * (fa + 4 * fm + fb), tol)]
+    I = e = 0.0
+    N = 3
+    k = 0
+    
+    while stack:
+        a, b, fa, fm, fb, whole, t = stack.pop()
+        m = (a + b) / 2
+        fl, fr = f(np.array([(a + m) / 2, (m + b) / 2]))
+        N += 2
+        
+        left = (m - a) / 6 * (fa + 4 * fl + fm)
+        right = (b - m) / 6 * (fm + 4 * fr + fb)
+        delta = left + right - whole
+        
+        if abs(delta) <= 15 * t:
+            I += left + right + delta / 15
+            e += abs(delta) / 15
+        else:
+            k += 1
+            if k > kmax:
+                raise ArithmeticError("Maximum number of iterations exceeded.")
+            stack.append((a, m, fa, fl, fm, left, t / 2))
+            stack.append((m, b, fm, fr, fb, right, t / 2))
+    
+    return float(I), float(e), N
+
+# Nodes and weights of the 15-point Kronrod rule on [-1, 1] (non-negative nodes
+# only) and of the embedded 7-point Gauss rule, which uses every other node.
+_kronrod_nodes = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.000000000000000000000000000000000])
+_kronrod_weights = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714])
+_gauss_weights = np.array([
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327])
+
+_gk_nodes = np.concatenate([-_kronrod_nodes, _kronrod_nodes[-2::-1]])
+_gk_weights = np.concatenate([_kronrod_weights, _kronrod_weights[-2::-1]])
+_g_weights = np.zeros(15)
+_g_weights[1::2] = np.concatenate([_gauss_weights, _gauss_weights[-2::-1]])
+
+def gauss_kronrod(f, a, b):
+    """
+    Approximate the integral of f over [a, b] by the 7-point Gauss, 15-point Kronrod pair.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float or np.ndarray
+        The lower limit(s) of integration.
+    b : float or np.ndarray
+        The upper limit(s) of integration; arrays of limits integrate many intervals at once.
+
+    Returns:
+    -------
+    tuple
+        I : float or np.ndarray
+            The Kronrod estimate of the integral(s).
+        e : float or np.ndarray
+            The difference between the Kronrod and Gauss estimates.
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    c = (a + b) / 2
+    r = (b - a) / 2
+    
+    F = f(c[..., np.newaxis] + r[..., np.newaxis] * _gk_nodes)
+    K = r * (F @ _gk_weights)
+    G = r * (F @ _g_weights)
+    
+    return K, np.abs(K - G)
+
+def adaptive_gauss_kronrod(f, a, b, tol, kmax):
+    """
+    Approximate the integral of f over [a, b] by globally adaptive Gauss-Kronrod quadrature.
+
+    At each step every interval whose error estimate exceeds its share of tol
+    is bisected, and all new intervals are evaluated in one call to f.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of one array.
+    a : float
+        The lower limit of integration.
+    b : float
+        The upper limit of integration.
+    tol : float
+        The tolerance for the total error.
+    kmax : int
+        The maximum number of bisection steps.
+
+    Returns:
+    -------
+    tuple
+        I : float
+            The estimated integral.
+        e : float
+            The error estimate.
+        N : int
+            The number of function evaluations.
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance (tol) must be positive.")
+    if kmax <= 0:
+        raise ValueError("Maximum iterations (kmax) must be positive.")
+    
+    A = np.array([a], dtype=float)
+    B = np.array([b], dtype=float)
+    K, E = gauss_kronrod(f, A, B)
+    N = 15
+    I = e = 0.0
+    
+    for k in range(kmax + 1):
+        # Intervals meeting their share of the tolerance are final.
+        done = E <= tol * (B - A) / abs(b - a)
+        I += K[done].sum()
+        e += E[done].sum()
+        A, B = A[~done], B[~done]
+        
+        if A.size == 0:
+            return float(I), float(e), N
+        
+        if e + E[~done].sum() <= tol:
+            return float(I + K[~done].sum()), float(e + E[~done].sum()), N
+        
+        M = (A + B) / 2
+        A, B = np.concatenate([A, M]), np.concatenate([M, B])
+        K, E = gauss_kronrod(f, A, B)
+        N += 15 * A.size
+    
+    raise ArithmeticError("Maximum number of iterations exceeded.")
+
+def integrate_region(f, a, b, g, h, tol, kmax, n=4):
+    """
+    Approximate the integral of f(x, y) over the region a <= x <= b, g(x) <= y <= h(x).
+
+    The inner integral over y is computed for all outer nodes at once with n
+    Gauss-Kronrod panels; at the nodes where its error estimate exceeds
+    tol / (2 (b - a)) it is recomputed by adaptive Gauss-Kronrod quadrature.
+    The outer integral over x is adaptive with tolerance tol / 2, so the two
+    errors together are within tol.
+
+    Parameters:
+    ----------
+    f : function
+        A vectorised function of two arrays.
+    a : float
+        The lower limit of x.
+    b : float
+        The upper limit of x.
+    g : function
+        The lower boundary y = g(x), vectorised.
+    h : function
+        The upper boundary y = h(x), vectorised.
+    tol : float
+        The tolerance for the total error.
+    kmax : int
+        The maximum number of bisection steps of each adaptive integral.
+    n : int, optional
+        The number of panels for the inner integral (default is 4).
+
+    Returns:
+    -------
+    tuple
+        I : float
+            The estimated integral.
+        e : float
+            The error estimate, the outer error plus (b - a) times the largest
+            inner error.
+        N : int
+            The number of evaluations of f.
+    """
+    if tol <= 0:
+        raise ValueError("Tolerance (tol) must be positive.")
+    
+    edges = np.arange(n + 1) / n
+    inner_tol = tol / (2 * abs(b - a)) if b != a else tol
+    inner_error = 0.0
+    N = 0
     
-    for i in range(1, n):
-        F.append(((2*i*x*y)*F[i] - (2*i + 1)*F[i - 1]) / (2*i**2))
+    def inner(x):
+        nonlocal inner_error, N
+        lo = np.broadcast_to(g(x), x.shape)[..., np.newaxis]
+        hi = np.broadcast_to(h(x), x.shape)[..., np.newaxis]
+        Y = lo + (hi - lo) * edges
+        K, E = gauss_kronrod(lambda y: f(x[..., np.newaxis, np.newaxis], y), Y[..., :-1], Y[..., 1:])
+        K, E = K.sum(axis=-1), E.sum(axis=-1)
+        N += 15 * n * x.size
+        
+        # Nodes where the fixed panels are not accurate enough are integrated adaptively.
+        for i in zip(*np.nonzero(E > inner_tol)):
+            xi = x[i]
+            K[i], E[i], Ni = adaptive_gauss_kronrod(lambda y: f(xi, y), lo[i][0], hi[i][0], inner_tol, kmax)
+            N += Ni
+        
+        inner_error = max(inner_error, E.max(initial=0.0))
+        return K
     
-    return sym.Poly(F[n], x, y, domain=sym.QQ)
+    I, e, _ = adaptive_gauss_kronrod(inner, a, b, tol / 2, kmax)
+    
+    return I, e + abs(b - a) * inner_error, N
 
-# Example usage:
-x, y = sym.symbols('x y')
-print(symbolicFn(3, x, y))
+if __name__ == "__main__":
+    # Example usage: the region x in [0, 1], y in [x^2, 1] used by S and T below.
+    print(integrate_region(lambda x, y: 1 + x**2 * y**2, 0, 1, lambda x: x**2, lambda x: np.ones_like(x), 1e-12, 50))
 
 # Define symbols
 x = sym.Symbol('x')
@@ -94,7 +644,77 @@ y = sym.Symbol('y')
 # Define function G
 G = 1 + x**2 * y**2
 
-def S(x):
+# Results of the S, D and T pipeline, keyed by the integrand and its symbols,
+# with the least recently used entry dropped once there are more than the limit.
+_pipeline_cache = OrderedDict()
+_pipeline_cache_size = 64
+
+def _pipeline_cached(key, make):
+    """
+    Return the cached pipeline result for key, computing it with make() if it is missing.
+    """
+    value = _pipeline_cache.get(key)
+    
+    if value is None:
+        value = _pipeline_cache[key] = make()
+        if len(_pipeline_cache) > _pipeline_cache_size:
+            _pipeline_cache.popitem(last=False)
+    else:
+        _pipeline_cache.move_to_end(key)
+    
+    return value
+
+def _inner_integral(G, x, y):
+    """
+    Return the integral of G with respect to y from y = x^2 to y = 1 as a polynomial in x.
+
+    Polynomial integrands are integrated term by term on their coefficients:
+    x^i y^j integrates to x^i (1 - x^(2j + 2)) / (j + 1). Other integrands fall
+    back to sym.integrate. Results are cached by (G, x, y).
+    """
+    def make():
+        if not G.is_polynomial(x, y):
+            return sym.Poly(sym.integrate(G, (y, x**2, 1)), x, domain=sym.QQ)
+        terms = {}
+        for (i, j), c in sym.Poly(G, x, y, domain=sym.QQ).terms():
+            c = c / (j + 1)
+            terms[(i,)] = terms.get((i,), 0) + c
+            terms[(i + 2*j + 2,)] = terms.get((i + 2*j + 2,), 0) - c
+        return sym.Poly.from_dict(terms, x, domain=sym.QQ)
+    
+    return _pipeline_cached(('S', G, x, y), make)
+
+def derivatives(x, k, G=G):
+    """
+    Compute the derivatives of orders 0 to k of the integral of G with respect to y
+    from y = x^2 to y = 1, in a single sweep.
+
+    Parameters:
+    ----------
+    x : sympy.Symbol
+        The variable of the polynomial.
+    k : int
+        The highest order of the derivative.
+    G : sympy expression, optional
+        The integrand, in x and y (default is the module's G).
+
+    Returns:
+    -------
+    list of sympy.Poly
+        The polynomials S, S', ..., S^(k).
+    """
+    if not isinstance(k, int) or k < 0:
+        raise ValueError("k must be a non-negative integer.")
+    
+    P = _pipeline_cached(('D', G, x, y), lambda: [_inner_integral(G, x, y)])
+    
+    # Each further order is one differentiation of the previous polynomial.
+    while len(P) <= k:
+        P.append(P[-1].diff(x))
+    
+    return P[:k + 1]
+
+def S(x, G=G):
     """
     Compute the polynomial S(x) which is the integral of G with respect to y
     from y = x^2 to y = 1, and return it as a sympy polynomial in x.
@@ -103,16 +723,17 @@ def S(x):
     ----------
     x : sympy.Symbol
         The variable of the polynomial.
+    G : sympy expression, optional
+        The integrand, in x and y (default is the module's G).
 
     Returns:
     -------
     sympy.Poly
         The resulting polynomial.
     """
-    integral = sym.integrate(G, (y, x**2, 1))
-    return sym.Poly(integral, x, domain=sym.QQ)
+    return _inner_integral(G, x, y)
 
-def D(x, n):
+def D(x, n, G=G):
     """
     Compute the nth derivative of the integral of G with respect to y from y = x^2 to y = 1,
     and return it as a sympy polynomial in x.
@@ -123,38 +744,52 @@ def D(x, n):
         The variable of the polynomial.
     n : int
         The order of the derivative.
+    G : sympy expression, optional
+        The integrand, in x and y (default is the module's G).
 
     Returns:
     -------
     sympy.Poly
         The resulting polynomial after differentiation.
     """
-    integral = sym.integrate(G, (y, x**2, 1))
-    derivative = sym.diff(integral, (x, n))
-    return sym.Poly(derivative, x, domain=sym.QQ)
+    return derivatives(x, n, G)[n]
 
-def T(a):
+def T(a, G=G):
     """
     Compute the definite integral of the integral of G with respect to y from y = x^2 to y = 1,
-    integrated with respect to x from 0 to a, and return it as a sympy polynomial in x.
+    integrated with respect to x from 0 to a, and return it as a sympy polynomial in a.
 
     Parameters:
     ----------
-    a : sympy.Symbol
+    a : sympy.Symbol, sympy expression or number
         The upper limit of the integral with respect to x.
+    G : sympy expression, optional
+        The integrand, in x and y (default is the module's G).
 
     Returns:
     -------
     sympy.Poly
-        The resulting polynomial after integration.
-    """
-    integral = sym.integrate(G, (y, x**2, 1))
-    definite_integral = sym.integrate(integral, (x, 0, a))
-    return sym.Poly(definite_integral, x, domain=sym.QQ)
-
-# Example usage:
-x, y = sym.symbols('x y')
-a = sym.Symbol('a')
-print(S(x))
-print(D(x, 2))
-print(T(a))
+        The resulting polynomial after integration: in the symbols of a, or
+        the constant value as a polynomial in x if a is a number.
+    """
+    # The antiderivative of a polynomial has no constant term, so it vanishes
+    # at x = 0 and evaluating at a symbol x = a only renames the generator.
+    P = _pipeline_cached(('T', G, x, y), lambda: _inner_integral(G, x, y).integrate(x))
+    
+    if isinstance(a, sym.Symbol):
+        return P.replace(x, a)
+    
+    # A numeric limit gives a constant, kept as a polynomial in x; an expression
+    # in other symbols gives a polynomial in those symbols.
+    a = sym.sympify(a)
+    gens = sorted(a.free_symbols, key=str) or [x]
+    
+    return sym.Poly(P.as_expr().subs(x, a), *gens, domain=sym.QQ)
+
+if __name__ == "__main__":
+    # Example usage:
+    x, y = sym.symbols('x y')
+    a = sym.Symbol('a')
+    print(S(x))
+    print(D(x, 2))
+    print(T(a))
@@ -46,6 +46,146 @@ def gram_schmidt_np(V):
 
     return A
 
+class OrthonormalBasis:
+    """
+    An orthonormal basis that is updated one vector at a time.
+
+    The basis vectors are the rows of a preallocated array that doubles in size
+    when full. Appending a vector orthogonalises it against the current basis
+    twice (classical Gram-Schmidt with reorthogonalisation), so each update costs
+    O(m k) for k vectors of length m instead of rebuilding the whole basis.
+
+    Parameters:
+    ----------
+    m : int
+        The length of the vectors.
+    capacity : int, optional
+        The number of vectors to allocate room for initially (default is 16).
+    tol : float, optional
+        A vector is dropped as linearly dependent when the norm of its component
+        orthogonal to the basis is at most tol times its own norm (default is 1e-10).
+    """
+
+    def __init__(self, m, capacity=16, tol=1e-10):
+        if m <= 0 or capacity <= 0:
+            raise ValueError("m and capacity must be positive.")
+        
+        self.m = m
+        self.tol = tol
+        self._Q = np.empty((capacity, m))
+        self._k = 0
+
+    def __len__(self):
+        return self._k
+
+    @property
+    def basis(self):
+        """
+        numpy.ndarray: The current basis vectors as the rows of a (k, m) array view.
+        """
+        return self._Q[:self._k]
+
+    def append(self, v):
+        """
+        Add a vector to the basis.
+
+        Parameters:
+        ----------
+        v : numpy.ndarray
+            The vector to add, of length m.
+
+        Returns:
+        -------
+        bool
+            True if the vector was added, False if it was dropped as nearly linearly dependent.
+        """
+        v = np.asarray(v, dtype=float)
+        if v.shape != (self.m,):
+            raise ValueError("The vector must have length m.")
+        
+        norm = np.linalg.norm(v)
+        if norm == 0:
+            return False
+        
+        Q = self.basis
+        u = v - Q.T @ (Q @ v)
+        u -= Q.T @ (Q @ u)
+        
+        norm_u = np.linalg.norm(u)
+        if norm_u <= self.tol * norm:
+            return False
+        
+        if self._k == len(self._Q):
+            self._Q = np.concatenate([self._Q, np.empty_like(self._Q)])
+        
+        self._Q[self._k] = u / norm_u
+        self._k += 1
+        
+        return True
+
+    def extend(self, V):
+        """
+        Add several vectors to the basis in turn.
+
+        Parameters:
+        ----------
+        V : iterable of numpy.ndarray
+            The vectors to add.
+
+        Returns:
+        -------
+        int
+            The number of vectors added.
+        """
+        return sum(self.append(v) for v in V)
+
+    def remove(self, i):
+        """
+        Remove the ith basis vector; the others stay orthonormal.
+
+        Parameters:
+        ----------
+        i : int
+            The index of the vector to remove.
+        """
+        if i < 0 or i >= self._k:
+            raise IndexError("Basis index out of bounds.")
+        
+        self._Q[i:self._k - 1] = self._Q[i + 1:self._k]
+        self._k -= 1
+
+    def coefficients(self, X):
+        """
+        Return the coordinates of vectors in the current basis.
+
+        Parameters:
+        ----------
+        X : numpy.ndarray
+            A vector of length m, or an (n, m) array with one vector per row.
+
+        Returns:
+        -------
+        numpy.ndarray
+            The coordinates, of length k or with shape (n, k).
+        """
+        return np.asarray(X, dtype=float) @ self.basis.T
+
+    def project(self, X):
+        """
+        Project vectors onto the subspace spanned by the basis.
+
+        Parameters:
+        ----------
+        X : numpy.ndarray
+            A vector of length m, or an (n, m) array with one vector per row.
+
+        Returns:
+        -------
+        numpy.ndarray
+            The projections, with the same shape as X.
+        """
+        return self.coefficients(X) @ self.basis
+
 def gram_schmidt_sp(V):
     """
     Perform the Gram-Schmidt process to construct an orthonormal set of vectors.